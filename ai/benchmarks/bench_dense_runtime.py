@@ -0,0 +1,93 @@
+"""
+Compare the Keras trust-score model with its NumPy export: process
+startup (import and model construction), resident memory and per-call
+latency. Each runtime is measured in a fresh Python process.
+
+Usage (from the ai/ directory; the keras run needs TensorFlow):
+    python benchmarks/bench_dense_runtime.py --batch-size 1 256 --calls 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+
+
+def measure(runtime: str, model_path: str, batch_sizes, calls: int):
+    """Runs in the child process; prints one JSON line."""
+    from utils.model_registry import _current_rss_bytes
+
+    rss_before = _current_rss_bytes()
+    started = time.perf_counter()
+    from models.trust_score import TrustScoreCalculator
+    calculator = TrustScoreCalculator(model_path=model_path)
+    startup = time.perf_counter() - started
+
+    import numpy as np
+    latencies = {}
+    for batch_size in batch_sizes:
+        x = np.random.default_rng(0).random((batch_size, 10), dtype=np.float32)
+        calculator._predict(x)
+        started = time.perf_counter()
+        for _ in range(calls):
+            calculator._predict(x)
+        latencies[batch_size] = (time.perf_counter() - started) / calls * 1000
+
+    print(json.dumps({
+        'runtime': type(calculator.model).__name__,
+        'startup_seconds': startup,
+        'rss_delta_mb': (_current_rss_bytes() - rss_before) / (1024 * 1024),
+        'latency_ms': latencies
+    }))
+
+
+def run_child(runtime: str, model_path: str, args) -> dict:
+    output = subprocess.run(
+        [
+            sys.executable, os.path.abspath(__file__), '--child', runtime,
+            '--model-path', model_path, '--calls', str(args.calls),
+            '--batch-size', *map(str, args.batch_size)
+        ],
+        cwd=AI_DIR,
+        env={**os.environ, 'MODEL_RUNTIME': runtime, 'TF_CPP_MIN_LOG_LEVEL': '3'},
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--batch-size', type=int, nargs='+', default=[1, 256])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--child', choices=['keras', 'numpy'])
+    parser.add_argument('--model-path')
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child, args.model_path, args.batch_size, args.calls)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'trust_score.npz')
+        from models.trust_score import TrustScoreCalculator
+        TrustScoreCalculator(model_path=model_path).export_model()
+
+        results = [run_child(runtime, model_path, args) for runtime in ('keras', 'numpy')]
+
+    for result in results:
+        print(f"{result['runtime']}")
+        print(f"  startup:  {result['startup_seconds']:8.2f} s")
+        print(f"  memory:   {result['rss_delta_mb']:8.1f} MB")
+        for batch_size, latency in result['latency_ms'].items():
+            print(f"  batch {batch_size:>5}: {latency:8.3f} ms/call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure financial scores per second for the previous per-user path
+(fit_transform on a single row and model.predict for every user) and the
+batch path (vectorized feature matrix, fitted scaler, one model call).
+
+Usage (from the ai/ directory):
+    python benchmarks/bench_financial_scores.py --count 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.preprocessing import MinMaxScaler
+
+from models.trust_score import TrustScoreCalculator
+
+
+def financial_records(count: int):
+    rng = random.Random(42)
+    return [
+        {
+            'credit_score': rng.randint(300, 850),
+            'payment_history': rng.random(),
+            'income_stability': rng.random(),
+            'debt_to_income': rng.random(),
+            'account_age': rng.randint(0, 20),
+            'transaction_consistency': rng.random(),
+            'default_risk': rng.random() * 0.3,
+            'fraud_risk': rng.random() * 0.1,
+            'savings_ratio': rng.random(),
+            'investment_diversity': rng.random()
+        }
+        for _ in range(count)
+    ]
+
+
+def legacy_scores(calculator: TrustScoreCalculator, records):
+    scaler = MinMaxScaler()
+    scores = []
+    for data in records:
+        features = calculator._extract_financial_features(data)
+        normalized_features = scaler.fit_transform(features.reshape(1, -1))
+        scores.append(float(calculator.model.predict(normalized_features, verbose=0)[0][0] * 100))
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--legacy-count', type=int, default=200,
+                        help='records scored through the per-user path (it is slow)')
+    args = parser.parse_args()
+
+    calculator = TrustScoreCalculator()
+    records = financial_records(args.count)
+
+    # Build the model's graph and start the inference pool outside the timings
+    legacy_scores(calculator, records[:1])
+    asyncio.run(calculator.calculate_financial_scores(records[:1]))
+
+    legacy_records = records[:args.legacy_count]
+    started = time.perf_counter()
+    legacy_scores(calculator, legacy_records)
+    legacy = len(legacy_records) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    scores = asyncio.run(calculator.calculate_financial_scores(records))
+    batch = len(records) / (time.perf_counter() - started)
+    assert len(scores) == len(records)
+
+    print(f"{args.count} financial records")
+    print(f"  per-user (legacy): {legacy:10.0f} scores/s")
+    print(f"  batch:             {batch:10.0f} scores/s  {batch / legacy:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
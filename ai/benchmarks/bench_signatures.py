@@ -0,0 +1,93 @@
+"""
+Measure signature verifications per second for the previous implementation
+(new Web3() and key recovery on every call), the shared fast path on first
+sight of a signature, the fast path for retried signatures, and batch
+verification over the CPU process pool.
+
+Usage (from the ai/ directory):
+    python benchmarks/bench_signatures.py --count 500 --chunk-size 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from web3 import Web3
+
+from utils import auth
+
+
+def legacy_verify(message: str, signature: str, address: str) -> bool:
+    w3 = Web3()
+    recovered_address = w3.eth.account.recover_message(
+        encode_defunct(text=message),
+        signature=signature
+    )
+    return recovered_address.lower() == address.lower()
+
+
+def signed_requests(count: int):
+    account = Account.create()
+    timestamp = int(time.time() * 1000)
+    requests = []
+    for index in range(count):
+        message = f"Document Verification Request\nTimestamp: {timestamp}\nFile: document-{index}.pdf"
+        signed = Account.sign_message(encode_defunct(text=message), account.key)
+        requests.append((message, signed.signature.hex(), account.address, timestamp))
+    return requests
+
+
+def rate(fn, requests) -> float:
+    started = time.perf_counter()
+    for message, signature, address, timestamp in requests:
+        assert fn(message, signature, address, timestamp)
+    return len(requests) / (time.perf_counter() - started)
+
+
+def batch_rate(requests, chunk_size: int) -> float:
+    items = [
+        {'message': message, 'signature': signature, 'address': address}
+        for message, signature, address, _ in requests
+    ]
+
+    async def run():
+        # The first call starts the worker processes; keep it out of the timing
+        await auth.verify_signatures_batch(items[:1], chunk_size)
+        started = time.perf_counter()
+        results = await auth.verify_signatures_batch(items[1:], chunk_size)
+        elapsed = time.perf_counter() - started
+        assert all(results)
+        return (len(items) - 1) / elapsed
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=500)
+    parser.add_argument('--chunk-size', type=int, default=auth.SIGNATURE_BATCH_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    requests = signed_requests(args.count)
+
+    legacy = rate(lambda m, s, a, t: legacy_verify(m, s, a), requests)
+    cold = rate(lambda m, s, a, t: auth.verify_signature(m, s, a, timestamp=t), requests)
+    warm = rate(lambda m, s, a, t: auth.verify_signature(m, s, a, timestamp=t), requests)
+
+    batch = batch_rate(signed_requests(args.count + 1), args.chunk_size)
+
+    print(f"{args.count} signatures")
+    print(f"  legacy:           {legacy:10.0f} verifications/s")
+    print(f"  fast path (new):  {cold:10.0f} verifications/s  {cold / legacy:5.1f}x")
+    print(f"  fast path (retry):{warm:10.0f} verifications/s  {warm / legacy:5.1f}x")
+    print(f"  batch (chunk {args.chunk_size}): {batch:8.0f} verifications/s  {batch / legacy:5.1f}x")
+    print(f"  {auth.signature_stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Compare the single-pass TextStatistics pipeline with the previous
+DocumentAnalyzer implementation, which tokenized the text separately for
+the document statistics and the content quality score.
+
+Usage (from the ai/ directory):
+    python benchmarks/bench_text_stats.py --size-mb 4
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nltk
+from nltk.corpus import stopwords
+from nltk.probability import FreqDist
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+from utils.text_stats import TextStatistics
+
+VOCABULARY = (
+    "the analysis of results shows that our research methodology and data "
+    "collection process produced strong evidence for the hypothesis while the "
+    "review team completed a detailed assessment of project delivery budget "
+    "stakeholders software engineering cloud platform migration leadership"
+).split()
+
+CITATIONS = ["(2021)", "[3]", "[1, 2]", "et al.", "cf."]
+
+
+def generate_text(size_bytes: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    paragraphs = []
+    total = 0
+    while total < size_bytes:
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 28))]
+            if rng.random() < 0.2:
+                words.append(rng.choice(CITATIONS))
+            sentences.append(' '.join(words).capitalize() + '.')
+        paragraph = ' '.join(sentences)
+        paragraphs.append(paragraph)
+        total += len(paragraph) + 2
+    return '\n\n'.join(paragraphs)
+
+
+def legacy_stats(text: str, stop_words) -> dict:
+    clean_text = re.sub(r'[^\w\s]', ' ', text)
+    words = word_tokenize(clean_text)
+    words = [w.lower() for w in words if w.isalnum()]
+    meaningful_words = [w for w in words if w not in stop_words]
+    sentences = sent_tokenize(text)
+    paragraphs = [p for p in text.split('\n\n') if p.strip()]
+    freq_dist = FreqDist(meaningful_words)
+    pos_tags = nltk.pos_tag(meaningful_words)
+    noun_count = sum(1 for _, tag in pos_tags if tag.startswith('N'))
+    return {
+        'word_count': len(words),
+        'sentence_count': len(sentences),
+        'paragraph_count': len(paragraphs),
+        'noun_ratio': noun_count / len(meaningful_words) if meaningful_words else 0,
+        'most_common_words': [word for word, _ in freq_dist.most_common(10)]
+    }
+
+
+def legacy_quality(text: str, stop_words) -> float:
+    words = word_tokenize(text.lower())
+    meaningful_words = [w for w in words if w not in stop_words]
+    word_diversity = len(set(meaningful_words)) / len(meaningful_words) if meaningful_words else 0
+    sentences = sent_tokenize(text)
+    avg_sentence_length = len(words) / len(sentences) if sentences else 0
+    sentence_complexity = min(avg_sentence_length / 20, 1.0)
+    technical_terms = [
+        'analysis', 'research', 'methodology', 'data', 'results',
+        'findings', 'evidence', 'study', 'report', 'hypothesis',
+        'investigation', 'conclusion', 'method', 'process', 'evaluation',
+        'assessment', 'review', 'examination', 'observation', 'theory'
+    ]
+    technical_term_count = sum(1 for word in meaningful_words if word.lower() in technical_terms)
+    technical_score = min(technical_term_count / (len(meaningful_words) * 0.05), 1.0)
+    citation_patterns = [r'\(\d{4}\)', r'\[[\d,\s]+\]', r'et al\.', r'see\.', r'cf\.']
+    citation_count = sum(len(re.findall(pattern, text)) for pattern in citation_patterns)
+    citation_score = min(citation_count / 5, 1.0)
+    return word_diversity * 0.3 + sentence_complexity * 0.2 + technical_score * 0.3 + citation_score * 0.2
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-mb', type=float, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    stop_words = set(stopwords.words('turkish') + stopwords.words('english'))
+
+    for size_mb in args.size_mb:
+        text = generate_text(int(size_mb * 1024 * 1024))
+
+        def legacy():
+            return legacy_stats(text, stop_words), legacy_quality(text, stop_words)
+
+        def single_pass():
+            stats = TextStatistics.from_text(text, stop_words)
+            return stats.as_dict(), stats.quality_score()
+
+        (old_stats, old_quality), old_time = timed(legacy)
+        (new_stats, new_quality), new_time = timed(single_pass)
+
+        print(f"{size_mb:g} MB input")
+        print(f"  legacy:      {old_time:8.2f}s  words={old_stats['word_count']} quality={old_quality:.3f}")
+        print(f"  single-pass: {new_time:8.2f}s  words={new_stats['word_count']} quality={new_quality:.3f}")
+        print(f"  speedup:     {old_time / new_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
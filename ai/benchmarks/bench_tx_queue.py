@@ -0,0 +1,86 @@
+"""
+Compare sequential send-and-wait transactions with the pipelined
+TransactionQueue against a local development node.
+
+Start a node first, ideally with interval mining so block time matters
+(for Hardhat, set networks.hardhat.mining.interval in hardhat.config.cts):
+    anvil --block-time 1
+    npx hardhat node
+
+Usage (from the ai/ directory):
+    python benchmarks/bench_tx_queue.py --count 20
+    python benchmarks/bench_tx_queue.py --rpc-url http://127.0.0.1:8545 --private-key 0x...
+
+Each transaction is a zero-value transfer to the sender itself, so no
+contract deployment is needed.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from utils.tx_queue import TransactionQueue
+
+# First account of the default Hardhat / anvil test mnemonic
+DEFAULT_PRIVATE_KEY = '0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80'
+
+
+async def sequential(w3, account, count: int) -> float:
+    chain_id = await w3.eth.chain_id
+    started = time.perf_counter()
+    for _ in range(count):
+        tx = {
+            'from': account.address,
+            'to': account.address,
+            'value': 0,
+            'gas': 21000,
+            'gasPrice': await w3.eth.gas_price,
+            'chainId': chain_id,
+            'nonce': await w3.eth.get_transaction_count(account.address)
+        }
+        signed_tx = account.sign_transaction(tx)
+        tx_hash = await w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        await w3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=0.1)
+    return time.perf_counter() - started
+
+
+async def pipelined(w3, account, count: int) -> float:
+    queue = TransactionQueue(w3, account, gas_limit=21000, max_pending=count)
+    started = time.perf_counter()
+    receipts = [
+        await queue.submit({'to': account.address, 'value': 0})
+        for _ in range(count)
+    ]
+    await asyncio.gather(*receipts)
+    elapsed = time.perf_counter() - started
+    print(f"  queue stats: {queue.stats()}")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rpc-url', default=os.getenv('RPC_URL', 'http://127.0.0.1:8545'))
+    parser.add_argument('--private-key', default=DEFAULT_PRIVATE_KEY)
+    parser.add_argument('--count', type=int, default=20)
+    args = parser.parse_args()
+
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(args.rpc_url))
+    account = Account.from_key(args.private_key)
+
+    old_time = await sequential(w3, account, args.count)
+    new_time = await pipelined(w3, account, args.count)
+
+    print(f"{args.count} transactions")
+    print(f"  sequential: {old_time:8.2f}s  {args.count / old_time:7.1f} tx/s")
+    print(f"  pipelined:  {new_time:8.2f}s  {args.count / new_time:7.1f} tx/s")
+    print(f"  speedup:    {old_time / new_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,16 +1,83 @@
-from fastapi import FastAPI, UploadFile, Form, HTTPException
+from fastapi import FastAPI, UploadFile, Form, HTTPException, Body
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+import asyncio
 import json
 import os
-import tempfile
-import aiohttp
-from models.social_analyzer import SocialMediaAnalyzer
-from models.document_analyzer import DocumentAnalyzer
-from utils.auth import verify_signature
-from utils.blockchain import update_blockchain_scores
+import sys
+from utils.auth import verify_signature, signature_stats
+from utils.model_registry import model_registry
+from utils.executors import analysis_executor
+from utils.inference import batcher_stats, inference_cache_stats
+from utils.cache import TieredCache
+from utils.http_client import http_pool
+from utils.uploads import UploadSizeLimitMiddleware, configure_upload_spooling
+from utils.startup import LazyComponent, WarmupTracker
 
-app = FastAPI()
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+UPLOAD_SPILL_BYTES = int(os.getenv('UPLOAD_SPILL_BYTES', str(1024 * 1024)))
+EVENT_INDEXER_ENABLED = os.getenv('EVENT_INDEXER', 'false').lower() in ('1', 'true', 'yes')
+PROFILE_BATCH_MAX_SIZE = int(os.getenv('PROFILE_BATCH_MAX_SIZE', '1000'))
+# background: serve immediately and warm up in a thread, blocking: warm up
+# before serving, lazy: load everything on first use
+WARMUP_MODE = os.getenv('WARMUP_MODE', 'background').lower()
+MODEL_WARMUP_ENABLED = os.getenv('MODEL_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+
+def _load_social_analyzer():
+    from models.social_analyzer import SocialMediaAnalyzer
+    return SocialMediaAnalyzer()
+
+def _load_document_analyzer():
+    from models.document_analyzer import DocumentAnalyzer
+    return DocumentAnalyzer()
+
+# Analyzers (and tweepy, linkedin_api, NLTK, the document parsers) are
+# imported on first use or by the warm-up, not when the app module loads
+social_analyzer = LazyComponent(_load_social_analyzer)
+document_analyzer = LazyComponent(_load_document_analyzer)
+
+warmup = WarmupTracker()
+if WARMUP_MODE != 'lazy':
+    warmup.add('social_analyzer', social_analyzer.get)
+    warmup.add('document_analyzer', document_analyzer.get)
+    if MODEL_WARMUP_ENABLED:
+        warmup.add('model_pipelines', model_registry.warm_up)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await http_pool.start()
+    # Mirror contract events into the local SQLite index in the background
+    indexer_task = None
+    if EVENT_INDEXER_ENABLED:
+        from utils.blockchain import run_event_indexer
+        indexer_task = asyncio.create_task(run_event_indexer())
+    warmup_task = None
+    if WARMUP_MODE == 'blocking':
+        await asyncio.to_thread(warmup.run)
+    else:
+        # /health answers right away; /ready reports progress
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup.run))
+    yield
+    if indexer_task is not None:
+        indexer_task.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await http_pool.close()
+    analysis_executor.shutdown(wait=False)
+
+app = FastAPI(lifespan=lifespan)
+
+# Uploads stay in memory below the spill threshold (for every form route)
+# and are cut off while streaming once they exceed the size limit. Added
+# before CORS so it runs inside it and its 413 carries the CORS headers.
+configure_upload_spooling(UPLOAD_SPILL_BYTES)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=MAX_UPLOAD_BYTES,
+    paths=["/analyze/document"]
+)
 
 # CORS settings
 app.add_middleware(
@@ -21,42 +88,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize analyzer classes
-social_analyzer = SocialMediaAnalyzer()
-document_analyzer = DocumentAnalyzer()
+# Analysis results keyed by document hash and analyzer/model version
+document_cache = TieredCache.from_env('DOCUMENT_CACHE', table='document_results')
 
 @app.post("/api/linkedin/token")
 async def get_linkedin_token(code: str) -> Dict:
     try:
-        # Get LinkedIn token
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                'https://www.linkedin.com/oauth/v2/accessToken',
-                data={
-                    'grant_type': 'authorization_code',
-                    'code': code,
-                    'client_id': os.getenv('LINKEDIN_CLIENT_ID'),
-                    'client_secret': os.getenv('LINKEDIN_CLIENT_SECRET'),
-                    'redirect_uri': os.getenv('LINKEDIN_REDIRECT_URI')
-                }
-            ) as response:
-                token_data = await response.json()
-                
-                if 'access_token' not in token_data:
-                    raise HTTPException(status_code=400, detail="Could not get LinkedIn token")
-                
-                # Get profile information
-                async with session.get(
-                    'https://api.linkedin.com/v2/me',
-                    headers={'Authorization': f"Bearer {token_data['access_token']}"}
-                ) as profile_response:
-                    profile_data = await profile_response.json()
-                    
-                    return {
-                        'accessToken': token_data['access_token'],
-                        'profileId': profile_data['id']
-                    }
+        # Get LinkedIn token over the shared keep-alive pool
+        session = http_pool.session
+        async with session.post(
+            'https://www.linkedin.com/oauth/v2/accessToken',
+            data={
+                'grant_type': 'authorization_code',
+                'code': code,
+                'client_id': os.getenv('LINKEDIN_CLIENT_ID'),
+                'client_secret': os.getenv('LINKEDIN_CLIENT_SECRET'),
+                'redirect_uri': os.getenv('LINKEDIN_REDIRECT_URI')
+            }
+        ) as response:
+            token_data = await response.json()
+            
+            if 'access_token' not in token_data:
+                raise HTTPException(status_code=400, detail="Could not get LinkedIn token")
+            
+        # Get profile information
+        async with session.get(
+            'https://api.linkedin.com/v2/me',
+            headers={'Authorization': f"Bearer {token_data['access_token']}"}
+        ) as profile_response:
+            profile_data = await profile_response.json()
+            
+            return {
+                'accessToken': token_data['access_token'],
+                'profileId': profile_data['id']
+            }
                     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -106,9 +174,17 @@ async def analyze_profile(
         
         # Get analysis results
         print("Starting social media analysis...")
-        results = await social_analyzer.analyze_profiles(social_data)
+        analyzer = await social_analyzer.aget()
+        results = await analyzer.analyze_profiles(social_data)
         print("Analysis results:", results)
         
+        if results.get('retry_after') and not results.get('details'):
+            raise HTTPException(
+                status_code=429,
+                detail="; ".join(results.get('errors', [])),
+                headers={"Retry-After": str(results['retry_after'])}
+            )
+        
         if not results or not results.get('overall'):
             raise HTTPException(
                 status_code=400,
@@ -117,6 +193,8 @@ async def analyze_profile(
             
         return results
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         print("JSON parsing error:", str(e))
         raise HTTPException(status_code=400, detail="Invalid JSON format")
@@ -124,6 +202,29 @@ async def analyze_profile(
         print("General error:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/profiles/batch")
+async def analyze_profiles_batch(profiles: List[Dict] = Body(..., embed=True)):
+    if not profiles:
+        raise HTTPException(status_code=400, detail="No profiles given")
+    if len(profiles) > PROFILE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many profiles (maximum {PROFILE_BATCH_MAX_SIZE} per batch)"
+        )
+    
+    try:
+        analyzer = await social_analyzer.aget()
+    except Exception as e:
+        print("General error:", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # One JSON result per line, in completion order
+    async def stream_results():
+        async for result in analyzer.analyze_profiles_batch(profiles):
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.post("/analyze/document")
 async def analyze_document(
     file: UploadFile,
@@ -134,38 +235,91 @@ async def analyze_document(
     try:
         # Verify signature
         message = f"Document Verification Request\nTimestamp: {timestamp}\nFile: {file.filename}"
-        if not verify_signature(message, signature, address):
-            raise HTTPException(status_code=401, detail="Invalid signature")
+        if not verify_signature(message, signature, address, timestamp=timestamp):
+            raise HTTPException(status_code=401, detail="Invalid or expired signature")
             
         # Determine file type
         file_ext = file.filename.split('.')[-1].lower()
         if file_ext not in ['pdf', 'docx', 'txt']:
             raise HTTPException(status_code=400, detail="Unsupported file format")
             
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file.flush()
+        if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File too large")
             
-            # Analyze document
-            analysis_result = await document_analyzer.analyze_document(
-                temp_file.name,
-                file_ext
-            )
+        analyzer = await document_analyzer.aget()
+        
+        # Reuse the result of an identical document analyzed before; the
+        # spooled upload is hashed in place without an extra copy. Hashing and
+        # the pipeline lookup for the model names stay off the event loop.
+        cache_key = await analysis_executor.run_inference(
+            analyzer.document_cache_key,
+            file.file,
+            file_ext
+        )
+        cached_result = await document_cache.aget(cache_key)
+        if cached_result is not None:
+            return cached_result
             
-        # Delete temporary file
-        os.unlink(temp_file.name)
+        # Analyze document straight from the upload buffer
+        analysis_result = await analyzer.analyze_document(file.file, file_ext)
+        
+        # Failed or degraded analyses are retried next time instead of cached
+        if 'error' not in analysis_result.get('details', {}) and not analysis_result.get('degraded'):
+            await document_cache.aset(cache_key, analysis_result)
         
         return analysis_result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/chain/profiles/{address}")
+async def get_indexed_profile(address: str):
+    if not EVENT_INDEXER_ENABLED:
+        raise HTTPException(status_code=503, detail="Event indexer is disabled")
+    
+    from utils.blockchain import get_event_indexer
+    
+    # Answered from the local event index instead of getProfile/getReferences
+    # RPCs; the SQLite reads run in the IO pool
+    indexed = await analysis_executor.run_blocking(get_event_indexer().lookup, address)
+    if indexed is None:
+        raise HTTPException(status_code=404, detail="Profile not indexed")
+    return indexed
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "message": "AI service is running"}
 
+@app.get("/ready")
+async def readiness_check():
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status['ready'] else 503)
+
+@app.get("/metrics")
+async def metrics() -> Dict:
+    # web3 is only imported by the blockchain paths; reading stats must not
+    # import it on the event loop
+    blockchain = sys.modules.get('utils.blockchain')
+    
+    social = social_analyzer.get() if social_analyzer.loaded else None
+    return {
+        "models": model_registry.stats(),
+        "warmup": warmup.status(),
+        # Cache stats count the rows of their SQLite tiers
+        "document_cache": await analysis_executor.run_blocking(document_cache.stats),
+        "social_cache": await analysis_executor.run_blocking(social.cache_stats) if social else {},
+        "rate_limits": social.rate_limit_stats() if social else {},
+        "executors": analysis_executor.stats(),
+        "http_pool": http_pool.stats(),
+        "signatures": signature_stats(),
+        # Event index counts are SQLite queries
+        "blockchain": await analysis_executor.run_blocking(blockchain.blockchain_stats) if blockchain else {},
+        "micro_batching": batcher_stats(),
+        "inference_cache": inference_cache_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,62 +1,161 @@
-import tensorflow as tf
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from transformers import pipeline
-import PyPDF2
-import docx
-import io
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import asyncio
 import hashlib
-from datetime import datetime
-import re
-import json
-from bs4 import BeautifulSoup
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.probability import FreqDist
-
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('averaged_perceptron_tagger')
+import os
+from utils.model_registry import get_pipeline
+from utils.zero_shot import GroupedZeroShotClassifier
+from utils.chunker import TextChunker, iter_batches
+from utils.text_stats import TextStatistics
+from utils.executors import analysis_executor
+from utils.startup import check_nltk_data
+from utils.inference import classify_sentiment, run_batched
+from utils.document_text import (
+    DocumentReadError,
+    DocumentSource,
+    extract_document,
+    iter_document_text,
+    load_stop_words,
+    open_document_source
+)
 
 class DocumentAnalyzer:
-    def __init__(self):
-        self.sentiment_analyzer = pipeline("sentiment-analysis")
-        self.text_classifier = pipeline("zero-shot-classification")
-        self.model = self._build_model()
-        self.stop_words = set(stopwords.words('turkish') + stopwords.words('english'))
+    # Bump whenever scoring logic changes so cached results are invalidated
+    ANALYZER_VERSION = "3"
+
+    PROFESSIONALISM_LABELS = [
+        "professional", "academic", "technical",
+        "formal", "casual", "informal"
+    ]
+    PROFESSIONAL_LABELS = ["professional", "academic", "technical", "formal"]
+
+    CREDIBILITY_LABELS = [
+        "objective", "evidence-based", "verifiable",
+        "subjective", "biased", "speculative"
+    ]
+    CREDIBLE_LABELS = ["objective", "evidence-based", "verifiable"]
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ):
+        # NLTK data must be installed with the service; it is never downloaded at runtime
+        check_nltk_data()
+        self.stop_words = load_stop_words()
+        self.batch_size = batch_size or int(os.getenv('ZERO_SHOT_BATCH_SIZE', '16'))
+        # 0 means no limit
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv('DOCUMENT_MAX_PAGES', '0'))
+        self.max_chars = max_chars if max_chars is not None else int(os.getenv('DOCUMENT_MAX_CHARS', '0'))
+        self._content_classifier = None
+        self._chunker = None
+
+    @property
+    def sentiment_analyzer(self):
+        return get_pipeline("sentiment-analysis")
+
+    @property
+    def text_classifier(self):
+        return get_pipeline("zero-shot-classification")
+
+    @property
+    def content_classifier(self) -> GroupedZeroShotClassifier:
+        if self._content_classifier is None:
+            self._content_classifier = GroupedZeroShotClassifier(
+                self.text_classifier,
+                {
+                    'professionalism': self.PROFESSIONALISM_LABELS,
+                    'credibility': self.CREDIBILITY_LABELS
+                },
+                batch_size=self.batch_size
+            )
+        return self._content_classifier
+
+    @property
+    def chunker(self) -> TextChunker:
+        if self._chunker is None:
+            self._chunker = TextChunker.for_pipelines(
+                self.sentiment_analyzer,
+                self.text_classifier,
+                reserved_tokens=self.content_classifier.hypothesis_tokens
+            )
+        return self._chunker
         
-    def _build_model(self):
-        model = tf.keras.Sequential([
-            tf.keras.layers.Dense(32, activation='relu', input_shape=(6,)),
-            tf.keras.layers.Dropout(0.2),
-            tf.keras.layers.Dense(16, activation='relu'),
-            tf.keras.layers.Dense(1, activation='sigmoid')
-        ])
-        model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-        return model
+    @classmethod
+    def document_digest(cls, source: DocumentSource) -> str:
+        """SHA-256 of the document bytes, read in chunks without copying the whole file."""
+        digest = hashlib.sha256()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            digest.update(source)
+            return digest.hexdigest()
 
-    async def analyze_document(self, file_path: str, file_type: str) -> Dict:
+        stream = open_document_source(source)
         try:
-            # Read document
-            text_content = await self._extract_text(file_path, file_type)
-            if not text_content:
-                return self._generate_error_response("Document content could not be read")
-            
-            # Basic analysis
-            doc_stats = self._calculate_stats(text_content)
-            
-            # Content analysis
-            content_scores = await self._analyze_content(text_content)
+            while chunk := stream.read(64 * 1024):
+                digest.update(chunk)
+        finally:
+            if isinstance(source, str):
+                stream.close()
+            else:
+                stream.seek(0)
+        return digest.hexdigest()
+
+    def cache_key(self, digest: str, file_type: str) -> str:
+        models = '|'.join(
+            getattr(pipe.model, 'name_or_path', '')
+            for pipe in (self.sentiment_analyzer, self.text_classifier)
+        )
+        return f"document:{self.ANALYZER_VERSION}:{models}:{file_type}:{digest}"
+
+    def document_cache_key(self, source: DocumentSource, file_type: str) -> str:
+        """
+        Cache key of a document. Hashes the whole document and may load the
+        pipelines whose names are part of the key, so run it off the event loop.
+        """
+        return self.cache_key(self.document_digest(source), file_type)
+
+    async def analyze_document(self, source: DocumentSource, file_type: str) -> Dict:
+        try:
+            if self._parse_in_worker(source):
+                # Process pool workers need the document bytes, not a handle;
+                # the worker decodes the whole document and gathers statistics
+                if not isinstance(source, (str, bytes)):
+                    source = self._read_source(source)
+                text_content, doc_stats, quality_score = await analysis_executor.run_cpu(
+                    extract_document,
+                    source,
+                    file_type,
+                    self.max_pages,
+                    self.max_chars
+                )
+                if not text_content:
+                    return self._generate_error_response("Document content could not be read")
+                
+                # Content analysis
+                content_scores = await self._analyze_content(text_content, quality_score=quality_score)
+            else:
+                # Pages are decoded, counted and chunked in a thread while the
+                # batches chunked from earlier pages are being scored
+                text_stats = TextStatistics(self.stop_words)
+                pieces = text_stats.observe(
+                    iter_document_text(source, file_type, self.max_pages, self.max_chars)
+                )
+                content_scores = await self._analyze_content(pieces, text_stats=text_stats)
+                if not text_stats.word_count:
+                    return self._generate_error_response("Document content could not be read")
+                doc_stats = text_stats.as_dict()
             
             # Reliability analysis
-            reliability_score = await self._analyze_reliability(text_content, doc_stats)
+            reliability_score = await self._analyze_reliability(doc_stats)
             
             # Calculate overall score
             overall_score = self._calculate_overall_score(doc_stats, content_scores, reliability_score)
             
             return {
                 'overall_score': overall_score,
+                # Fallback scores from a failed model pass must not be cached
+                'degraded': content_scores.get('degraded', False),
                 'details': {
                     'document_stats': doc_stats,
                     'content_analysis': content_scores,
@@ -68,120 +167,63 @@ class DocumentAnalyzer:
             print(f"Document analysis error: {e}")
             return self._generate_error_response(str(e))
     
-    async def _extract_text(self, file_path: str, file_type: str) -> Optional[str]:
-        try:
-            if file_type == 'pdf':
-                with open(file_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text()
-                    return text
-                    
-            elif file_type == 'docx':
-                doc = docx.Document(file_path)
-                return "\n".join([paragraph.text for paragraph in doc.paragraphs])
-                
-            elif file_type == 'txt':
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    return file.read()
-                    
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
-                
-        except Exception as e:
-            print(f"Text extraction error: {e}")
-            return None
-            
-    def _calculate_stats(self, text: str) -> Dict:
+    def _parse_in_worker(self, source: DocumentSource) -> bool:
+        # Only small in-memory documents are sent whole to the process pool.
+        # Files, disk-spooled uploads and every document outside process
+        # mode are streamed here, so decoding overlaps with inference and a
+        # large upload is never copied into memory at once.
+        if analysis_executor.cpu_mode != 'process' or isinstance(source, str):
+            return False
+        return not self._is_spooled_to_disk(source)
+    
+    @staticmethod
+    def _is_spooled_to_disk(source: DocumentSource) -> bool:
+        # SpooledTemporaryFile (UploadFile.file) past its rollover size, or
+        # any other file-backed stream
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return False
+        if hasattr(source, '_rolled'):
+            return source._rolled
         try:
-            # Text cleaning
-            clean_text = re.sub(r'[^\w\s]', ' ', text)
-            
-            # Word analysis
-            words = word_tokenize(clean_text)
-            words = [w.lower() for w in words if w.isalnum()]
-            meaningful_words = [w for w in words if w not in self.stop_words]
-            
-            # Sentence analysis
-            sentences = sent_tokenize(text)
-            
-            # Paragraph analysis
-            paragraphs = [p for p in text.split('\n\n') if p.strip()]
-            
-            # Word frequency analysis
-            freq_dist = FreqDist(meaningful_words)
-            
-            # POS tagging
-            pos_tags = nltk.pos_tag(meaningful_words)
-            noun_count = sum(1 for _, tag in pos_tags if tag.startswith('N'))
-            verb_count = sum(1 for _, tag in pos_tags if tag.startswith('V'))
-            
-            return {
-                'word_count': len(words),
-                'unique_words': len(set(words)),
-                'vocabulary_richness': len(set(meaningful_words)) / len(meaningful_words) if meaningful_words else 0,
-                'avg_word_length': sum(len(w) for w in words) / len(words) if words else 0,
-                'sentence_count': len(sentences),
-                'avg_sentence_length': len(words) / len(sentences) if sentences else 0,
-                'paragraph_count': len(paragraphs),
-                'noun_ratio': noun_count / len(meaningful_words) if meaningful_words else 0,
-                'verb_ratio': verb_count / len(meaningful_words) if meaningful_words else 0,
-                'most_common_words': [word for word, _ in freq_dist.most_common(10)]
-            }
-            
-        except Exception as e:
-            print(f"Statistics calculation error: {e}")
-            return None
+            source.fileno()
+            return True
+        except (AttributeError, OSError):
+            # In-memory buffers such as BytesIO
+            return False
+
+    @staticmethod
+    def _read_source(source: DocumentSource) -> bytes:
+        if isinstance(source, (bytearray, memoryview)):
+            return bytes(source)
+        stream = open_document_source(source)
+        data = stream.read()
+        stream.seek(0)
+        return data
+
+    def _collect_statistics(self, text: str) -> TextStatistics:
+        return TextStatistics.from_text(text, self.stop_words)
 
-    async def _analyze_content(self, text: str) -> Dict:
+    async def _analyze_content(
+        self,
+        text: Union[str, Iterable[str]],
+        quality_score: Optional[float] = None,
+        text_stats: Optional[TextStatistics] = None
+    ) -> Dict:
         try:
-            # Split text into sections
-            sections = [text[i:i+512] for i in range(0, len(text), 512)]
-            
-            # Professionalism analysis
-            professionalism_scores = []
-            for section in sections:
-                prof_result = self.text_classifier(
-                    section,
-                    candidate_labels=[
-                        "professional", "academic", "technical",
-                        "formal", "casual", "informal"
-                    ]
-                )
-                prof_score = sum(
-                    score for label, score in zip(prof_result['labels'], prof_result['scores'])
-                    if label in ["professional", "academic", "technical", "formal"]
-                )
-                professionalism_scores.append(prof_score)
-            
-            # Credibility analysis
-            credibility_scores = []
-            for section in sections:
-                cred_result = self.text_classifier(
-                    section,
-                    candidate_labels=[
-                        "objective", "evidence-based", "verifiable",
-                        "subjective", "biased", "speculative"
-                    ]
+            # Model inference is micro-batched with concurrent requests
+            section_scores = await self._score_sections(text)
+            
+            # Content quality analysis (streamed statistics are complete once
+            # every section has been read)
+            if quality_score is None:
+                quality_score = self._analyze_content_quality(
+                    text_stats if text_stats is not None else self._collect_statistics(text)
                 )
-                cred_score = sum(
-                    score for label, score in zip(cred_result['labels'], cred_result['scores'])
-                    if label in ["objective", "evidence-based", "verifiable"]
-                )
-                credibility_scores.append(cred_score)
-            
-            # Sentiment analysis
-            sentiment_results = self.sentiment_analyzer(sections)
-            sentiment_score = sum(1 for result in sentiment_results if result['label'] == 'POSITIVE') / len(sentiment_results)
-            
-            # Content quality analysis
-            quality_score = self._analyze_content_quality(text)
             
             # Calculate final scores
-            professionalism = (np.mean(professionalism_scores) * 0.7 + quality_score * 0.3) * 100
-            credibility = (np.mean(credibility_scores) * 0.7 + quality_score * 0.3) * 100
-            sentiment = sentiment_score * 100
+            professionalism = (section_scores['professionalism'] * 0.7 + quality_score * 0.3) * 100
+            credibility = (section_scores['credibility'] * 0.7 + quality_score * 0.3) * 100
+            sentiment = section_scores['sentiment'] * 100
             
             return {
                 'professionalism': max(0, min(100, professionalism)),
@@ -189,62 +231,80 @@ class DocumentAnalyzer:
                 'sentiment': max(0, min(100, sentiment))
             }
             
+        except DocumentReadError:
+            # An unreadable document is an error, not a degraded score
+            raise
         except Exception as e:
             print(f"Content analysis error: {e}")
             return {
                 'professionalism': 50.0,
                 'credibility': 50.0,
-                'sentiment': 50.0
+                'sentiment': 50.0,
+                'degraded': True
             }
     
-    def _analyze_content_quality(self, text: str) -> float:
+    def _iter_section_batches(self, text: Union[str, Iterable[str]]) -> Iterator[List[str]]:
+        return iter_batches(self.chunker.iter_chunks(text), self.batch_size)
+
+    def _classify_sections(self, sections: List[str]) -> List[Dict]:
+        return self.content_classifier.classify(sections)
+
+    async def _score_sections(self, text: Union[str, Iterable[str]]) -> Dict:
+        """
+        Professionalism, credibility and sentiment analysis, streamed over
+        sentence-packed chunks one batch at a time. text may be a string or
+        a stream of pages; the next batch is decoded and chunked in a thread
+        while the current one is being scored.
+        """
+        professionalism_scores = []
+        credibility_scores = []
+        positive_sections = 0
+        section_count = 0
+        
+        # Decoding and chunking (tokenization) also stay off the event loop
+        batches = await analysis_executor.run_inference(self._iter_section_batches, text)
+        next_batch = asyncio.ensure_future(analysis_executor.run_blocking(next, batches, None))
         try:
-            # Word diversity check
-            words = word_tokenize(text.lower())
-            meaningful_words = [w for w in words if w not in self.stop_words]
-            word_diversity = len(set(meaningful_words)) / len(meaningful_words) if meaningful_words else 0
-            
-            # Sentence structure analysis
-            sentences = sent_tokenize(text)
-            avg_sentence_length = len(words) / len(sentences) if sentences else 0
-            sentence_complexity = min(avg_sentence_length / 20, 1.0)  # 20 words optimal
-            
-            # Technical term usage
-            technical_terms = [
-                'analysis', 'research', 'methodology', 'data', 'results',
-                'findings', 'evidence', 'study', 'report', 'hypothesis',
-                'investigation', 'conclusion', 'method', 'process', 'evaluation',
-                'assessment', 'review', 'examination', 'observation', 'theory'
-            ]
-            technical_term_count = sum(1 for word in meaningful_words if word.lower() in technical_terms)
-            technical_score = min(technical_term_count / (len(meaningful_words) * 0.05), 1.0)
-            
-            # Reference and citation check
-            citation_patterns = [
-                r'\(\d{4}\)',  # (2024)
-                r'\[[\d,\s]+\]',  # [1] or [1,2]
-                r'et al\.',
-                r'see\.',
-                r'cf\.'
-            ]
-            citation_count = sum(len(re.findall(pattern, text)) for pattern in citation_patterns)
-            citation_score = min(citation_count / 5, 1.0)
-            
-            # Calculate overall quality score
-            quality_factors = [
-                (word_diversity, 0.3),
-                (sentence_complexity, 0.2),
-                (technical_score, 0.3),
-                (citation_score, 0.2)
-            ]
-            
-            return sum(score * weight for score, weight in quality_factors)
-            
+            while sections := await next_batch:
+                next_batch = asyncio.ensure_future(analysis_executor.run_blocking(next, batches, None))
+                group_results, sentiment_results = await asyncio.gather(
+                    run_batched(self._classify_sections, sections),
+                    classify_sentiment(sections)
+                )
+                for result in group_results:
+                    professionalism_scores.append(sum(
+                        score for label, score in result['professionalism'].items()
+                        if label in self.PROFESSIONAL_LABELS
+                    ))
+                    credibility_scores.append(sum(
+                        score for label, score in result['credibility'].items()
+                        if label in self.CREDIBLE_LABELS
+                    ))
+                
+                positive_sections += sum(1 for result in sentiment_results if result['label'] == 'POSITIVE')
+                section_count += len(sections)
+        finally:
+            # Abandon the prefetch if scoring failed; its outcome no longer matters
+            next_batch.cancel()
+            next_batch.add_done_callback(lambda done: done.cancelled() or done.exception())
+        
+        if not section_count:
+            raise ValueError("Document text produced no sections to score")
+        
+        return {
+            'professionalism': np.mean(professionalism_scores),
+            'credibility': np.mean(credibility_scores),
+            'sentiment': positive_sections / section_count
+        }
+    
+    def _analyze_content_quality(self, text_stats: TextStatistics) -> float:
+        try:
+            return text_stats.quality_score()
         except Exception as e:
             print(f"Content quality analysis error: {e}")
             return 0.5
     
-    async def _analyze_reliability(self, text: str, stats: Dict) -> float:
+    async def _analyze_reliability(self, stats: Dict) -> float:
         try:
             reliability_factors = []
             
@@ -1,15 +1,31 @@
 from typing import List, Dict
 import numpy as np
-from transformers import pipeline
 import aiohttp
 import asyncio
 from datetime import datetime
+from utils.model_registry import get_pipeline
+from utils.chunker import TextChunker
+from utils.executors import analysis_executor
+from utils.inference import classify_sentiment
 
 class ReferenceValidator:
     def __init__(self):
-        self.text_classifier = pipeline("zero-shot-classification")
-        self.sentiment_analyzer = pipeline("sentiment-analysis")
-        
+        self._chunker = None
+
+    @property
+    def sentiment_analyzer(self):
+        return get_pipeline("sentiment-analysis")
+
+    @property
+    def text_classifier(self):
+        return get_pipeline("zero-shot-classification")
+
+    @property
+    def chunker(self) -> TextChunker:
+        if self._chunker is None:
+            self._chunker = TextChunker.for_pipelines(self.sentiment_analyzer)
+        return self._chunker
+
     async def validate_references(self, references: List[Dict]) -> float:
         if not references:
             return 50.0
@@ -119,10 +135,13 @@ class ReferenceValidator:
                 
             content = reference['content']
             
-            # Sentiment analysis
-            sentiment = self.sentiment_analyzer(content)[0]
-            sentiment_score = 100 if sentiment['label'] == 'POSITIVE' else 0
-            sentiment_score *= sentiment['score']
+            # Sentiment analysis over sentence-packed chunks
+            sections = await analysis_executor.run_inference(self._chunk_content, content)
+            sentiments = await classify_sentiment(sections)
+            sentiment_score = np.mean([
+                (100 if sentiment['label'] == 'POSITIVE' else 0) * sentiment['score']
+                for sentiment in sentiments
+            ])
             
             # Content authenticity
             authenticity_score = await self._analyze_content_authenticity(content)
@@ -153,6 +172,9 @@ class ReferenceValidator:
             print(f"Error analyzing reference content: {e}")
             return 50.0
             
+    def _chunk_content(self, content: str) -> List[str]:
+        return list(self.chunker.iter_chunks(content)) or [content]
+            
     def _calculate_reference_weight(self, reference: Dict) -> float:
         try:
             base_weight = 1.0
@@ -1,11 +1,9 @@
-from transformers import pipeline
 import numpy as np
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 import re
-import tensorflow as tf
 import json
 import tweepy
 import os
@@ -13,13 +11,20 @@ from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from linkedin_api import Linkedin
 import time
+from utils.model_registry import get_pipeline
+from utils.inference import classify_sentiment, classify_zero_shot
+from utils.executors import analysis_executor
+from utils.cache import TieredCache
+from utils.rate_limit import RateLimitExceeded, RateLimitScheduler
 
 load_dotenv()
 
 class TwitterAPI:
     def __init__(self):
-        self._cache = {}
-        self._cache_timeout = 300  # 5 minutes
+        # Bounded LRU with a 5 minute TTL; TWITTER_CACHE_PATH shares it across workers
+        self._cache = TieredCache.from_env(
+            'TWITTER_CACHE', max_entries=1024, ttl=300, table='twitter_users', stale_ttl=3600
+        )
         
         # Load Twitter API credentials
         self.client_id = os.getenv('TWITTER_CLIENT_ID')
@@ -39,8 +44,14 @@ class TwitterAPI:
             consumer_secret=self.client_secret,
             access_token=self.access_token,
             access_token_secret=self.access_token_secret,
-            wait_on_rate_limit=True
+            wait_on_rate_limit=False
+        )
+        
+        # Track the x-rate-limit-* headers instead of sleeping inside a request
+        self.rate_limits = RateLimitScheduler(
+            max_wait=float(os.getenv('TWITTER_RATE_LIMIT_MAX_WAIT', '5'))
         )
+        self.client.session.hooks['response'].append(self.rate_limits.observe_response)
         
     async def get_user_data(self, username: str) -> Dict:
         try:
@@ -55,83 +66,103 @@ class TwitterAPI:
             # Remove @ symbol
             username = username.replace('@', '')
                 
-            # Check cache
-            cache_key = f"twitter_user_{username}"
-            cached_data = self._get_from_cache(cache_key)
-            if cached_data:
-                print(f"Data retrieved from cache: {username}")
-                return cached_data
-                
-            print(f"Fetching Twitter data: {username}")
-            
-            # Get user info
-            user = self.client.get_user(
-                username=username,
-                user_fields=['created_at', 'description', 'location', 
-                            'public_metrics', 'verified', 'profile_image_url']
-            )
-            
-            if not user.data:
-                print(f"User not found: {username}")
-                return None
-                
-            # Get tweets
-            tweets = self.client.get_users_tweets(
-                user.data.id,
-                max_results=10,
-                tweet_fields=['created_at', 'public_metrics']
-            )
-            
-            # Calculate account age
-            account_age = (datetime.now(timezone.utc) - user.data.created_at).days / 365
-            
-            # Create tweet list
-            tweet_list = []
-            if tweets.data:
-                for tweet in tweets.data:
-                    tweet_list.append({
-                        'text': tweet.text,
-                        'likes': tweet.public_metrics['like_count'],
-                        'retweets': tweet.public_metrics['retweet_count']
-                    })
-            
-            # Calculate engagement rate
-            engagement_rate = self._calculate_engagement_rate(
-                user.data.public_metrics['followers_count'],
-                tweet_list
-            )
-            
-            # Calculate influence score
-            influence_score = self._calculate_influence_score(
-                user.data.public_metrics['followers_count'],
-                user.data.public_metrics['following_count'],
-                engagement_rate,
-                account_age
-            )
-            
-            result = {
-                'followers': user.data.public_metrics['followers_count'],
-                'following': user.data.public_metrics['following_count'],
-                'tweet_count': user.data.public_metrics['tweet_count'],
-                'account_age_years': account_age,
-                'engagement_rate': engagement_rate,
-                'influence_score': influence_score,
-                'recent_tweets': [tweet['text'] for tweet in tweet_list],
-                'description': user.data.description or '',
-                'verified': user.data.verified,
-                'location': user.data.location or '',
-                'profile_image_url': user.data.profile_image_url or ''
-            }
-            
-            # Save to cache
-            self._set_cache(cache_key, result)
-            
-            return result
-            
+            # Concurrent requests for the same user share a single fetch
+            cache_key = f"twitter_user_{username.lower()}"
+            try:
+                return await self._cache.get_or_fetch(
+                    cache_key,
+                    lambda: self._fetch_user_data(username)
+                )
+            except RateLimitExceeded:
+                stale_data = await self._cache.aget_stale(cache_key)
+                if stale_data is None:
+                    raise
+                print(f"Twitter rate limit reached, serving cached data: {username}")
+                return {**stale_data, 'stale': True}
+            
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"Twitter data retrieval error ({username}): {str(e)}")
             return None
             
+    async def _fetch_user_data(self, username: str) -> Optional[Dict]:
+        print(f"Fetching Twitter data: {username}")
+        
+        # Get user info (tweepy is blocking; keep it off the event loop)
+        user = await self._call(
+            'get_user',
+            self.client.get_user,
+            username=username,
+            user_fields=['created_at', 'description', 'location', 
+                        'public_metrics', 'verified', 'profile_image_url']
+        )
+        
+        if not user.data:
+            print(f"User not found: {username}")
+            return None
+            
+        # Get tweets
+        tweets = await self._call(
+            'get_users_tweets',
+            self.client.get_users_tweets,
+            user.data.id,
+            max_results=10,
+            tweet_fields=['created_at', 'public_metrics']
+        )
+        
+        # Calculate account age
+        account_age = (datetime.now(timezone.utc) - user.data.created_at).days / 365
+        
+        # Create tweet list
+        tweet_list = []
+        if tweets.data:
+            for tweet in tweets.data:
+                tweet_list.append({
+                    'text': tweet.text,
+                    'likes': tweet.public_metrics['like_count'],
+                    'retweets': tweet.public_metrics['retweet_count']
+                })
+        
+        # Calculate engagement rate
+        engagement_rate = self._calculate_engagement_rate(
+            user.data.public_metrics['followers_count'],
+            tweet_list
+        )
+        
+        # Calculate influence score
+        influence_score = self._calculate_influence_score(
+            user.data.public_metrics['followers_count'],
+            user.data.public_metrics['following_count'],
+            engagement_rate,
+            account_age
+        )
+        
+        result = {
+            'followers': user.data.public_metrics['followers_count'],
+            'following': user.data.public_metrics['following_count'],
+            'tweet_count': user.data.public_metrics['tweet_count'],
+            'account_age_years': account_age,
+            'engagement_rate': engagement_rate,
+            'influence_score': influence_score,
+            'recent_tweets': [tweet['text'] for tweet in tweet_list],
+            'description': user.data.description or '',
+            'verified': user.data.verified,
+            'location': user.data.location or '',
+            'profile_image_url': user.data.profile_image_url or ''
+        }
+        
+        return result
+            
+    async def _call(self, endpoint: str, fn, *args, **kwargs):
+        try:
+            return await self.rate_limits.call(endpoint, fn, *args, **kwargs)
+        except tweepy.TooManyRequests:
+            # The response hook has already recorded the window reset time
+            bucket = self.rate_limits.bucket(endpoint)
+            bucket.exhaust(bucket.retry_after() or 60)
+            raise RateLimitExceeded(endpoint, bucket.retry_after())
+            
     def _calculate_engagement_rate(self, followers: int, tweets: List[Dict]) -> float:
         if not tweets or followers == 0:
             return 0.0
@@ -167,64 +198,61 @@ class TwitterAPI:
         ) * 100
         
         return influence_score
-        
-    def _get_from_cache(self, key: str) -> Optional[Dict]:
-        cached_data = self._cache.get(key)
-        if cached_data:
-            timestamp, data = cached_data
-            if time.time() - timestamp < self._cache_timeout:
-                return data
-        return None
-        
-    def _set_cache(self, key: str, data: Dict):
-        self._cache[key] = (time.time(), data)
 
 class LinkedInAPI:
     def __init__(self):
-        self.api = None
-        
-    async def authenticate(self, access_token: str):
-        self.api = Linkedin(access_token=access_token)
+        self._cache = TieredCache.from_env('LINKEDIN_CACHE', max_entries=1024, ttl=300, table='linkedin_profiles')
+
+    async def authenticate(self, access_token: str) -> Linkedin:
+        # A client per request: concurrent profiles must not share credentials
+        return await analysis_executor.run_blocking(Linkedin, access_token=access_token)
         
     async def get_profile_data(self, access_token: str, profile_id: str) -> Dict:
         try:
-            # Connect to LinkedIn API
-            await self.authenticate(access_token)
-            
-            # Get profile info
-            profile = self.api.get_profile(profile_id)
-            
-            # Calculate experience years
-            experience_years = self._calculate_experience_years(profile.get('experience', []))
-            
-            # Determine education level
-            education_level = self._determine_education_level(profile.get('education', []))
-            
-            # Calculate activity score
-            activity_score = self._calculate_activity_score(
-                profile.get('posts', []),
-                profile.get('articles', []),
-                profile.get('activity', [])
+            # Concurrent requests for the same profile share a single fetch
+            return await self._cache.get_or_fetch(
+                f"linkedin_profile_{profile_id}",
+                lambda: self._fetch_profile_data(access_token, profile_id)
             )
             
-            # Calculate profile completion rate
-            profile_completion = self._calculate_profile_completion(profile)
-            
-            return {
-                'connections': profile.get('connections', 0),
-                'experience_years': experience_years,
-                'education_level': education_level,
-                'skills': profile.get('skills', [])[:10],
-                'endorsements': profile.get('endorsements_count', 0),
-                'recommendations': len(profile.get('recommendations', [])),
-                'activity_score': activity_score,
-                'profile_completion': profile_completion
-            }
-            
         except Exception as e:
             print(f"LinkedIn data retrieval error: {e}")
             return None
             
+    async def _fetch_profile_data(self, access_token: str, profile_id: str) -> Optional[Dict]:
+        # Connect to LinkedIn API
+        api = await self.authenticate(access_token)
+        
+        # Get profile info
+        profile = await analysis_executor.run_blocking(api.get_profile, profile_id)
+        
+        # Calculate experience years
+        experience_years = self._calculate_experience_years(profile.get('experience', []))
+        
+        # Determine education level
+        education_level = self._determine_education_level(profile.get('education', []))
+        
+        # Calculate activity score
+        activity_score = self._calculate_activity_score(
+            profile.get('posts', []),
+            profile.get('articles', []),
+            profile.get('activity', [])
+        )
+        
+        # Calculate profile completion rate
+        profile_completion = self._calculate_profile_completion(profile)
+        
+        return {
+            'connections': profile.get('connections', 0),
+            'experience_years': experience_years,
+            'education_level': education_level,
+            'skills': profile.get('skills', [])[:10],
+            'endorsements': profile.get('endorsements_count', 0),
+            'recommendations': len(profile.get('recommendations', [])),
+            'activity_score': activity_score,
+            'profile_completion': profile_completion
+        }
+            
     def _calculate_experience_years(self, experiences: List[Dict]) -> float:
         total_years = 0
         current_year = datetime.now(timezone.utc).year
@@ -301,41 +329,56 @@ class LinkedInAPI:
 
 class SocialMediaAnalyzer:
     def __init__(self):
-        self.sentiment_analyzer = pipeline("sentiment-analysis")
-        self.text_classifier = pipeline("zero-shot-classification")
         self.twitter_api = TwitterAPI()
         self.linkedin_api = LinkedInAPI()
+        self.timeouts = {
+            'twitter': float(os.getenv('TWITTER_TIMEOUT', '10')),
+            'linkedin': float(os.getenv('LINKEDIN_TIMEOUT', '10'))
+        }
+        self.batch_concurrency = int(os.getenv('PROFILE_BATCH_CONCURRENCY', '16'))
+
+    @property
+    def sentiment_analyzer(self):
+        return get_pipeline("sentiment-analysis")
+
+    @property
+    def text_classifier(self):
+        return get_pipeline("zero-shot-classification")
         
     async def analyze_profiles(self, social_data: Dict) -> Dict:
         try:
             scores = {}
             details = {}
             errors = []
+            retry_after = 0
             
-            # Twitter analysis
+            # Run the platform pipelines concurrently, each with its own timeout
+            pipelines = {}
             if twitter_username := social_data.get('twitter', {}).get('username'):
-                try:
-                    twitter_data = await self.twitter_api.get_user_data(twitter_username)
-                    if twitter_data:
-                        twitter_score = await self._analyze_twitter(twitter_data)
-                        scores['twitter'] = twitter_score
-                        details['twitter_data'] = twitter_data
-                except Exception as e:
-                    errors.append(str(e))
-            
-            # LinkedIn analysis
+                pipelines['twitter'] = self._twitter_pipeline(twitter_username)
             if linkedin_data := social_data.get('linkedin'):
-                try:
-                    profile_data = await self.linkedin_api.get_profile_data(
-                        linkedin_data.get('accessToken'),
-                        linkedin_data.get('profileId')
-                    )
-                    if profile_data:
-                        linkedin_score = await self._analyze_linkedin(profile_data)
-                        scores['linkedin'] = linkedin_score
-                        details['linkedin_data'] = profile_data
-                except Exception as e:
-                    errors.append(f"LinkedIn analysis error: {str(e)}")
+                pipelines['linkedin'] = self._linkedin_pipeline(linkedin_data)
+            
+            outcomes = await asyncio.gather(
+                *(
+                    asyncio.wait_for(pipeline, timeout=self.timeouts[platform])
+                    for platform, pipeline in pipelines.items()
+                ),
+                return_exceptions=True
+            )
+            
+            # Keep whatever finished; report the rest as errors
+            for platform, outcome in zip(pipelines, outcomes):
+                label = 'Twitter' if platform == 'twitter' else 'LinkedIn'
+                if isinstance(outcome, RateLimitExceeded):
+                    errors.append(f"{label} {outcome}")
+                    retry_after = max(retry_after, outcome.retry_after)
+                elif isinstance(outcome, asyncio.TimeoutError):
+                    errors.append(f"{label} analysis timed out after {self.timeouts[platform]}s")
+                elif isinstance(outcome, Exception):
+                    errors.append(f"{label} analysis error: {str(outcome)}")
+                elif outcome is not None:
+                    scores[platform], details[f'{platform}_data'] = outcome
             
             # Calculate overall score
             if scores:
@@ -360,6 +403,8 @@ class SocialMediaAnalyzer:
             
             if errors:
                 result['errors'] = errors
+            if retry_after:
+                result['retry_after'] = retry_after
             
             return result
             
@@ -371,6 +416,75 @@ class SocialMediaAnalyzer:
                 'errors': [str(e)]
             }
 
+    async def analyze_profiles_batch(self, profiles: List[Dict], concurrency: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Analyze many profiles (each shaped like analyze_profiles input, with
+        an optional 'id'), yielding {'id': ..., **result} per profile as soon
+        as it finishes. Identical profiles are analyzed once and at most
+        `concurrency` run at a time. Tweets of concurrently running profiles
+        share forward passes through the inference micro-batchers, and a
+        username shared by several profiles is fetched once via the cache.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.batch_concurrency)
+        
+        # Dedupe identical profiles; every requested id still gets a line
+        groups = {}
+        for index, profile in enumerate(profiles):
+            profile_id = profile.get('id', index)
+            social_data = {k: v for k, v in profile.items() if k in ('twitter', 'linkedin') and v}
+            if not social_data:
+                yield {
+                    'id': profile_id,
+                    'error': "At least one social media profile (LinkedIn or Twitter) required"
+                }
+                continue
+            key = json.dumps(social_data, sort_keys=True)
+            groups.setdefault(key, (social_data, []))[1].append(profile_id)
+        
+        async def run(social_data: Dict) -> Dict:
+            async with semaphore:
+                return await self.analyze_profiles(social_data)
+        
+        pending = {
+            asyncio.ensure_future(run(social_data)): ids
+            for social_data, ids in groups.values()
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    for profile_id in pending.pop(task):
+                        yield {'id': profile_id, **result}
+        finally:
+            # The client went away mid-stream; stop the remaining work
+            for task in pending:
+                task.cancel()
+
+    def rate_limit_stats(self) -> Dict:
+        return {'twitter': self.twitter_api.rate_limits.stats()}
+
+    def cache_stats(self) -> Dict:
+        return {
+            'twitter': self.twitter_api._cache.stats(),
+            'linkedin': self.linkedin_api._cache.stats()
+        }
+
+    async def _twitter_pipeline(self, username: str) -> Optional[Tuple[float, Dict]]:
+        twitter_data = await self.twitter_api.get_user_data(username)
+        if not twitter_data:
+            return None
+        return await self._analyze_twitter(twitter_data), twitter_data
+
+    async def _linkedin_pipeline(self, linkedin_data: Dict) -> Optional[Tuple[float, Dict]]:
+        profile_data = await self.linkedin_api.get_profile_data(
+            linkedin_data.get('accessToken'),
+            linkedin_data.get('profileId')
+        )
+        if not profile_data:
+            return None
+        return await self._analyze_linkedin(profile_data), profile_data
+
     async def _analyze_twitter(self, data: Dict) -> float:
         if not data:
             return 50.0
@@ -387,7 +501,7 @@ class SocialMediaAnalyzer:
             tweets = data.get('recent_tweets', [])
             if tweets:
                 # Sentiment analysis
-                sentiments = self.sentiment_analyzer(tweets[:10])
+                sentiments = await classify_sentiment(tweets[:10])
                 sentiment_scores = [100 if s['label'] == 'POSITIVE' else 0 for s in sentiments]
                 sentiment_score = sum(sentiment_scores) / len(sentiment_scores)
                 features.append(sentiment_score)
@@ -473,9 +587,9 @@ class SocialMediaAnalyzer:
     async def _analyze_tweet_content(self, tweets: List[str]) -> float:
         try:
             # Classify tweets
-            results = self.text_classifier(
+            results = await classify_zero_shot(
                 tweets,
-                candidate_labels=["informative", "professional", "spam", "offensive"]
+                ["informative", "professional", "spam", "offensive"]
             )
             
             # Calculate quality score
@@ -1,19 +1,55 @@
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler
 from typing import List, Tuple, Optional, Dict
-import tensorflow as tf
-from eth_account.messages import encode_defunct
-from web3 import Web3
 import json
+import numbers
 import os
+from utils.auth import verify_signature
+from utils.executors import analysis_executor
+from utils.dense_runtime import export_dense_model, load_dense_model
+
+# (alan, varsayılan değer, dönüşüm) - sıra, modelin girdi sırasıdır
+FINANCIAL_FEATURES = (
+    ('credit_score', 650, lambda column: column / 850),         # Kredi skoru
+    ('payment_history', 0.8, None),                              # Ödeme geçmişi
+    ('income_stability', 0.7, None),                             # Gelir istikrarı
+    ('debt_to_income', 0.3, None),                               # Borç/Gelir oranı
+    ('account_age', 5, lambda column: column / 20),              # Hesap yaşı
+    ('transaction_consistency', 0.8, None),                      # İşlem tutarlılığı
+    ('default_risk', 0.1, lambda column: 1 - column),            # Temerrüt riski
+    ('fraud_risk', 0.05, lambda column: 1 - column),             # Dolandırıcılık riski
+    ('savings_ratio', 0.2, None),                                # Tasarruf oranı
+    ('investment_diversity', 0.6, None)                          # Yatırım çeşitliliği
+)
+
+# Modelin Dense katmanları (birim sayısı, aktivasyon); Dropout çıkarımda kullanılmaz
+FINANCIAL_MODEL_LAYERS = ((64, 'relu'), (32, 'relu'), (16, 'relu'), (1, 'sigmoid'))
+
+# Varsayılan dosyalar çalışma dizininden değil bu dosyanın konumundan (ai/data) çözülür
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# Ölçekleyici gerçek kayıtlarla eğitilmediyse kullanılan özellik aralıkları
+FINANCIAL_FEATURE_BOUNDS = ([0.0] * len(FINANCIAL_FEATURES), [1.0] * len(FINANCIAL_FEATURES))
 
 class TrustScoreCalculator:
-    def __init__(self):
-        self.model = self._build_model()
-        self.scaler = MinMaxScaler()
-        self.w3 = Web3(Web3.HTTPProvider(os.getenv("UNITS_RPC_URL")))
+    def __init__(self, scaler_path: Optional[str] = None, model_path: Optional[str] = None):
+        self.model_path = model_path or os.getenv(
+            'TRUST_MODEL_PATH', os.path.join(DATA_DIR, 'models', 'trust_score.npz')
+        )
+        self.model = load_dense_model(
+            self.model_path,
+            len(FINANCIAL_FEATURES),
+            FINANCIAL_MODEL_LAYERS,
+            self._build_model
+        )
+        self.scaler_path = scaler_path or os.getenv(
+            'FINANCIAL_SCALER_PATH', os.path.join(DATA_DIR, 'financial_scaler.json')
+        )
+        self.scaler = self._load_scaler()
         
     def _build_model(self):
+        import tensorflow as tf
+
         model = tf.keras.Sequential([
             tf.keras.layers.Dense(64, activation='relu', input_shape=(10,)),
             tf.keras.layers.Dropout(0.2),
@@ -25,58 +61,116 @@ class TrustScoreCalculator:
         model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
         return model
 
+    def export_model(self, path: Optional[str] = None) -> str:
+        """
+        Eğitilmiş ağırlıkları NumPy çalışma zamanı için kaydet; sonraki
+        başlatmalar TensorFlow yüklemeden bu dosyayı kullanır
+        """
+        path = path or self.model_path
+        export_dense_model(self.model, path)
+        return path
+
     def verify_signature(self, message: str, signature: str, address: str) -> bool:
-        message_hash = encode_defunct(text=message)
+        # Ortak hızlı yol: modül düzeyindeki hesap yardımcısı ve imzalayan önbelleği
+        return verify_signature(message, signature, address)
+
+    def _load_scaler(self) -> MinMaxScaler:
+        """
+        Ölçekleyiciyi bir kez hazırla: kayıtlı min/max değerleri varsa onları,
+        yoksa özelliklerin bilinen aralıklarını kullan
+        """
+        bounds = FINANCIAL_FEATURE_BOUNDS
         try:
-            signer = self.w3.eth.account.recover_message(message_hash, signature=signature)
-            return signer.lower() == address.lower()
+            if os.path.exists(self.scaler_path):
+                with open(self.scaler_path) as f:
+                    saved = json.load(f)
+                bounds = (saved['data_min'], saved['data_max'])
         except Exception as e:
-            print(f"İmza doğrulama hatası: {e}")
-            return False
+            print(f"Ölçekleyici yüklenemedi, varsayılan aralıklar kullanılıyor: {e}")
+        # (min, max) satırlarına göre eğitmek kayıtlı dönüşümü birebir üretir
+        return MinMaxScaler().fit(np.array(bounds, dtype=np.float64))
+
+    def fit_scaler(self, financial_records: List[Dict]):
+        """
+        Ölçekleyiciyi kayıt kümesi üzerinde eğit ve kaydet
+        Args:
+            financial_records: finansal veri sözlüklerinin listesi
+        """
+        features = self._financial_feature_matrix(financial_records)
+        # Geçersiz alan içeren kayıtlar ölçekleyiciyi etkilemez
+        self.scaler = MinMaxScaler().fit(features[np.isfinite(features).all(axis=1)])
+        os.makedirs(os.path.dirname(os.path.abspath(self.scaler_path)), exist_ok=True)
+        with open(self.scaler_path, 'w') as f:
+            json.dump({
+                'features': [name for name, _, _ in FINANCIAL_FEATURES],
+                'data_min': self.scaler.data_min_.tolist(),
+                'data_max': self.scaler.data_max_.tolist()
+            }, f)
 
     async def calculate_financial_score(self, financial_data: Optional[Dict]) -> float:
-        if not financial_data:
-            return 50.0
+        return (await self.calculate_financial_scores([financial_data]))[0]
+
+    async def calculate_financial_scores(self, financial_records: List[Optional[Dict]]) -> List[float]:
+        """
+        Tüm kayıtları tek özellik matrisi ve tek model çağrısıyla skorla
+        Args:
+            financial_records: finansal veri sözlükleri; boş kayıtlar ve
+                sayısal olmayan alan içeren kayıtlar 50.0 alır
+        """
+        scores = [50.0] * len(financial_records)
+        indexes = [index for index, data in enumerate(financial_records) if data]
+        if not indexes:
+            return scores
 
         try:
-            features = self._extract_financial_features(financial_data)
-            normalized_features = self.scaler.fit_transform(features.reshape(1, -1))
-            score = float(self.model.predict(normalized_features)[0][0] * 100)
+            features = self._financial_feature_matrix([financial_records[index] for index in indexes])
+            
+            # Hatalı satırlar yalnızca kendi kullanıcılarını etkiler
+            valid_rows = np.isfinite(features).all(axis=1)
+            for index, valid in zip(indexes, valid_rows):
+                if not valid:
+                    print(f"Geçersiz finansal veri, kayıt {index} atlandı")
+            indexes = [index for index, valid in zip(indexes, valid_rows) if valid]
+            if not indexes:
+                return scores
+            
+            normalized_features = self.scaler.transform(features[valid_rows]).astype(np.float32)
+            predictions = await analysis_executor.run_inference(self._predict, normalized_features)
             
             # Skor doğrulama
-            if not (0 <= score <= 100):
-                print(f"Geçersiz skor hesaplandı: {score}")
-                return 50.0
-                
-            return score
+            for index, score in zip(indexes, predictions.tolist()):
+                if not (0 <= score <= 100):
+                    print(f"Geçersiz skor hesaplandı: {score}")
+                    continue
+                scores[index] = score
         except Exception as e:
             print(f"Finansal skor hesaplama hatası: {e}")
-            return 50.0
+        return scores
+
+    def _predict(self, normalized_features: np.ndarray) -> np.ndarray:
+        # Modeli doğrudan çağırmak predict()'in her çağrıdaki hazırlığını atlar
+        return np.asarray(self.model(normalized_features, training=False)).reshape(-1) * 100
 
     def _extract_financial_features(self, data: Dict) -> np.ndarray:
-        features = []
-        
-        # Kredi geçmişi
-        features.append(data.get('credit_score', 650) / 850)  # Kredi skoru
-        features.append(data.get('payment_history', 0.8))     # Ödeme geçmişi
-        
-        # Gelir istikrarı
-        features.append(data.get('income_stability', 0.7))    # Gelir istikrarı
-        features.append(data.get('debt_to_income', 0.3))      # Borç/Gelir oranı
-        
-        # Hesap aktivitesi
-        features.append(data.get('account_age', 5) / 20)      # Hesap yaşı
-        features.append(data.get('transaction_consistency', 0.8))  # İşlem tutarlılığı
-        
-        # Risk faktörleri
-        features.append(1 - data.get('default_risk', 0.1))    # Temerrüt riski
-        features.append(1 - data.get('fraud_risk', 0.05))     # Dolandırıcılık riski
-        
-        # Ek metrikler
-        features.append(data.get('savings_ratio', 0.2))       # Tasarruf oranı
-        features.append(data.get('investment_diversity', 0.6)) # Yatırım çeşitliliği
-        
-        return np.array(features)
+        return self._financial_feature_matrix([data])[0]
+
+    def _financial_feature_matrix(self, records: List[Dict]) -> np.ndarray:
+        # Her özellik bir sütun olarak okunur ve dönüşümü tüm sütuna uygulanır;
+        # sayısal olmayan değerler NaN olur ve satırı geçersiz kılar
+        columns = []
+        for name, default, transform in FINANCIAL_FEATURES:
+            column = np.fromiter(
+                (self._feature_value(record, name, default) for record in records),
+                dtype=np.float64,
+                count=len(records)
+            )
+            columns.append(transform(column) if transform else column)
+        return np.column_stack(columns)
+
+    @staticmethod
+    def _feature_value(record: Dict, name: str, default: float) -> float:
+        value = record.get(name, default) if isinstance(record, dict) else None
+        return float(value) if isinstance(value, numbers.Real) else np.nan
 
     def calculate_overall_score(self, component_scores: List[Tuple[float, float]]) -> float:
         """
@@ -2,11 +2,19 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import asyncio
+import hashlib
 import os
+import re
+import threading
+import time
 from dotenv import load_dotenv
+from eth_account import Account
 from eth_account.messages import encode_defunct
-from web3 import Web3
+
+from utils.cache import MemoryCache
+from utils.executors import analysis_executor
 
 load_dotenv()
 
@@ -15,6 +23,28 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# İmza zaman damgası en fazla bu kadar eski olabilir (saniye)
+SIGNATURE_MAX_AGE_SECONDS = float(os.getenv("SIGNATURE_MAX_AGE_SECONDS", "300"))
+SIGNATURE_CLOCK_SKEW_SECONDS = float(os.getenv("SIGNATURE_CLOCK_SKEW_SECONDS", "30"))
+SIGNATURE_CACHE_SIZE = int(os.getenv("SIGNATURE_CACHE_SIZE", "10000"))
+# Toplu doğrulamada bir işçi sürecine gönderilen imza sayısı
+SIGNATURE_BATCH_CHUNK_SIZE = int(os.getenv("SIGNATURE_BATCH_CHUNK_SIZE", "64"))
+
+# (mesaj özeti, imza) -> kurtarılan adres; girdiler imza penceresiyle birlikte sona erer
+_recovered_signers = MemoryCache(max_entries=SIGNATURE_CACHE_SIZE, ttl=SIGNATURE_MAX_AGE_SECONDS)
+_signature_counters = {'cache_hits': 0, 'recoveries': 0, 'stale': 0, 'invalid': 0, 'replayed': 0}
+
+# Kabul edilmiş (adres, zaman damgası) çiftleri; aynı imzalı istek pencere
+# içinde ikinci kez kabul edilmez. Kayıtlar bu sürece özeldir.
+_consumed_signatures = MemoryCache(
+    max_entries=SIGNATURE_CACHE_SIZE,
+    ttl=SIGNATURE_MAX_AGE_SECONDS + SIGNATURE_CLOCK_SKEW_SECONDS
+)
+_consume_lock = threading.Lock()
+
+# Ön yüzün imzaladığı mesajlardaki "Timestamp: <değer>" satırı
+_MESSAGE_TIMESTAMP = re.compile(r'^Timestamp:\s*(\S+)\s*$', re.MULTILINE)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -42,7 +72,64 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return username
 
-def verify_signature(message: str, signature: str, address: str) -> bool:
+def is_fresh_timestamp(timestamp: Union[str, int, float], now: Optional[float] = None) -> bool:
+    """
+    Zaman damgasının imza penceresi içinde olup olmadığını kontrol eder.
+    Milisaniye (Date.now()) ve saniye cinsinden değerler kabul edilir.
+    """
+    try:
+        value = float(timestamp)
+    except (TypeError, ValueError):
+        return False
+    if value > 1e12:
+        value /= 1000
+    now = time.time() if now is None else now
+    return now - SIGNATURE_MAX_AGE_SECONDS <= value <= now + SIGNATURE_CLOCK_SKEW_SECONDS
+
+def message_timestamp(message: str) -> Optional[str]:
+    """İmzalanan mesajın içindeki zaman damgası; yoksa None."""
+    match = _MESSAGE_TIMESTAMP.search(message)
+    return match.group(1) if match else None
+
+def recover_signer(message: str, signature: str) -> Optional[str]:
+    """
+    İmzalayan adresi (küçük harf) döndürür; geçersiz imzada None.
+    Yakın zamanda doğrulanan çiftler önbellekten gelir ve secp256k1
+    kurtarma işlemi atlanır.
+    """
+    key = _signature_key(message, signature)
+    signer = _recovered_signers.get(key)
+    if signer is not None:
+        _signature_counters['cache_hits'] += 1
+        return signer or None
+
+    _signature_counters['recoveries'] += 1
+    signer = _recover(message, signature)
+    if not signer:
+        _signature_counters['invalid'] += 1
+    _recovered_signers.set(key, signer)
+    return signer or None
+
+def _signature_key(message: str, signature: str) -> str:
+    return hashlib.sha256(message.encode('utf-8')).hexdigest() + ':' + signature.lower()
+
+def _recover(message: str, signature: str) -> str:
+    # Geçersiz imzada boş dize; işçi süreçlerinde de çalışır
+    try:
+        return Account.recover_message(encode_defunct(text=message), signature=signature).lower()
+    except Exception as e:
+        print(f"İmza doğrulama hatası: {e}")
+        return ''
+
+def _recover_chunk(pairs: List[Tuple[str, str]]) -> List[str]:
+    return [_recover(message, signature) for message, signature in pairs]
+
+def verify_signature(
+    message: str,
+    signature: str,
+    address: str,
+    timestamp: Optional[Union[str, int, float]] = None
+) -> bool:
     """
     Units Network imzasını doğrular.
     
@@ -50,25 +137,104 @@ def verify_signature(message: str, signature: str, address: str) -> bool:
         message: İmzalanan mesaj
         signature: İmza
         address: İmzalayan adres
+        timestamp: Mesajdaki zaman damgası; verilirse pencere dışındaki
+            (eski) imzalar kurtarma yapılmadan reddedilir ve geçerli imza
+            tek kullanımlık olur
         
     Returns:
         bool: İmza geçerli ise True, değilse False
+    
+    Zaman damgası verildiğinde (adres, zaman damgası) çifti ilk başarılı
+    doğrulamada tüketilir; aynı imzalı istek pencere içinde tekrar
+    gönderilirse reddedilir. Tüketilen çiftler süreç belleğinde tutulur,
+    bu yüzden birden çok uvicorn işçisi varsa başka bir işçiye gönderilen
+    tekrar pencere içinde kabul edilebilir.
     """
-    try:
-        w3 = Web3()
-        
-        # Mesajı encode et
-        message_hash = encode_defunct(text=message)
+    if timestamp is not None and not is_fresh_timestamp(timestamp):
+        _signature_counters['stale'] += 1
+        return False
+    
+    signer = recover_signer(message, signature)
+    
+    # Adresleri karşılaştır
+    if signer is None or signer != address.lower():
+        return False
+    
+    if timestamp is not None and not _consume_signature(signer, timestamp):
+        _signature_counters['replayed'] += 1
+        return False
+    return True
+
+def _consume_signature(address: str, timestamp: Union[str, int, float]) -> bool:
+    # Çift daha önce kullanılmadıysa kaydeder ve True döndürür
+    key = f"{address}:{timestamp}"
+    with _consume_lock:
+        if _consumed_signatures.get(key) is not None:
+            return False
+        _consumed_signatures.set(key, True)
+        return True
+
+async def verify_signatures_batch(items: Sequence[Dict], chunk_size: Optional[int] = None) -> List[bool]:
+    """
+    Birden çok imzayı doğrular; sonuçlar girdi sırasıyla döner.
+    
+    Args:
+        items: 'message', 'signature' ve 'address' alanları olan
+            sözlükler; mesaj bir "Timestamp: <değer>" satırı içermelidir
+        chunk_size: Bir işçi sürecine gönderilen imza sayısı
+            (varsayılan SIGNATURE_BATCH_CHUNK_SIZE)
         
-        # İmzadan adresi çıkar
-        recovered_address = w3.eth.account.recover_message(
-            message_hash,
-            signature=signature
+    Returns:
+        List[bool]: Her öğe için imza geçerli ise True
+    
+    Tazelik, imzalanan mesajdaki zaman damgasına göre kontrol edilir;
+    ayrı gönderilen bir zaman damgası imzalı olmadığından dikkate alınmaz.
+    Bu fonksiyon yalnızca imzaları doğrular ve hiçbir çifti tüketmez;
+    bir isteği yetkilendirmek için verify_signature kullanılmalıdır.
+    Zaman damgası olmayan, pencere dışı ve önbellekteki imzalar burada
+    yanıtlanır; kalanların kurtarma işlemi süreç havuzuna parçalar halinde
+    dağıtılır.
+    """
+    chunk_size = max(1, chunk_size or SIGNATURE_BATCH_CHUNK_SIZE)
+    results = [False] * len(items)
+    signers = [None] * len(items)
+    pending = []
+    
+    for index, item in enumerate(items):
+        if not is_fresh_timestamp(message_timestamp(item['message'])):
+            _signature_counters['stale'] += 1
+            continue
+        signer = _recovered_signers.get(_signature_key(item['message'], item['signature']))
+        if signer is not None:
+            _signature_counters['cache_hits'] += 1
+            signers[index] = signer
+        else:
+            pending.append(index)
+    
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+    recovered = await asyncio.gather(*(
+        analysis_executor.run_cpu(
+            _recover_chunk,
+            [(items[index]['message'], items[index]['signature']) for index in chunk]
         )
-        
-        # Adresleri karşılaştır
-        return recovered_address.lower() == address.lower()
-        
-    except Exception as e:
-        print(f"İmza doğrulama hatası: {e}")
-        return False
\ No newline at end of file
+        for chunk in chunks
+    ))
+    for chunk, chunk_signers in zip(chunks, recovered):
+        for index, signer in zip(chunk, chunk_signers):
+            _signature_counters['recoveries'] += 1
+            if not signer:
+                _signature_counters['invalid'] += 1
+            _recovered_signers.set(_signature_key(items[index]['message'], items[index]['signature']), signer)
+            signers[index] = signer
+    
+    for index, signer in enumerate(signers):
+        results[index] = bool(signer) and signer == items[index]['address'].lower()
+    return results
+
+def signature_stats() -> Dict:
+    return {
+        **_signature_counters,
+        'cached_pairs': len(_recovered_signers),
+        'consumed_pairs': len(_consumed_signatures),
+        'max_age_seconds': SIGNATURE_MAX_AGE_SECONDS
+    }
@@ -1,19 +1,66 @@
-from web3 import Web3
-from typing import Dict
+from web3 import AsyncWeb3
+from web3.logs import DISCARD
+from eth_account import Account
+from typing import Dict, List, Optional
+import asyncio
+import functools
 import json
 import os
 from dotenv import load_dotenv
 
+from utils.http_client import http_pool
+from utils.event_indexer import EventIndexer
+from utils.executors import analysis_executor
+from utils.micro_batcher import MicroBatcher
+from utils.score_mirror import ScoreMirror
+from utils.tx_queue import TransactionQueue
+
 load_dotenv()
 
+# Resolved from this file so the service does not depend on the working directory
+CONTRACT_ABI_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src', 'contracts', 'TrustNet.json'
+)
+
+TX_GAS_LIMIT = 2000000
+
+# Must not exceed TrustNet.MAX_BATCH_SIZE
+SCORE_BATCH_MAX_SIZE = int(os.getenv('SCORE_BATCH_MAX_SIZE', '200'))
+SCORE_BATCH_GAS_LIMIT = int(os.getenv('SCORE_BATCH_GAS_LIMIT', '8000000'))
+SCORE_BATCH_MAX_LATENCY_MS = float(os.getenv('SCORE_BATCH_MAX_LATENCY_MS', '2000'))
+
+# Updates where no score moves by more than this are not written
+SCORE_WRITE_MIN_DELTA = int(os.getenv('SCORE_WRITE_MIN_DELTA', '0'))
+
+
+@functools.lru_cache(maxsize=None)
+def load_contract_abi(path: str = CONTRACT_ABI_PATH) -> List[Dict]:
+    with open(path) as f:
+        return json.load(f)['abi']
+
+
+def abi_has(abi: List[Dict], entry_type: str, name: str) -> bool:
+    return any(entry.get('type') == entry_type and entry.get('name') == name for entry in abi)
+
+
 class BlockchainService:
+    """
+    Long-lived connection to the TrustNet contract. RPC calls go through an
+    AsyncWeb3 provider that reuses the shared aiohttp session, so they do
+    not block the event loop; the ABI, contract object, signing account
+    and chain ID are resolved once. Transactions are pipelined through a
+    TransactionQueue that assigns nonces locally, and score updates from
+    concurrent callers are grouped into batchUpdateScores transactions.
+    """
+
     def __init__(self):
-        self.w3 = Web3(Web3.HTTPProvider(os.getenv('RPC_URL', 'http://localhost:8545')))
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(
+            os.getenv('RPC_URL', 'http://localhost:8545'),
+            request_kwargs={'timeout': float(os.getenv('RPC_TIMEOUT', '30'))}
+        ))
         
         # Kontrat ABI ve adresini yükle
-        with open('../src/contracts/TrustNet.json') as f:
-            contract_data = json.load(f)
-            self.contract_abi = contract_data['abi']
+        self.contract_abi = load_contract_abi()
             
         self.contract_address = os.getenv('CONTRACT_ADDRESS')
         if not self.contract_address:
@@ -31,7 +78,56 @@ class BlockchainService:
             raise ValueError("PRIVATE_KEY çevresel değişkeni bulunamadı")
             
         # Hesabı oluştur
-        self.account = self.w3.eth.account.from_key(self.private_key)
+        self.account = Account.from_key(self.private_key)
+        
+        # Artifacts compiled before batchUpdateScores existed only support
+        # one updateScores transaction per user
+        self.supports_batch_updates = abi_has(self.contract_abi, 'function', 'batchUpdateScores')
+        if not self.supports_batch_updates:
+            print("Contract ABI has no batchUpdateScores; writing score updates one by one")
+        
+        chain_id = os.getenv('CHAIN_ID')
+        self._chain_id = int(chain_id) if chain_id else None
+        self._session_attached = False
+        self.tx_queue = TransactionQueue.from_env(
+            self.w3, self.account, chain_id=self._chain_id, gas_limit=TX_GAS_LIMIT
+        )
+        
+        # Pending score updates are collected for up to the latency window
+        self.score_batcher = MicroBatcher(
+            self._write_score_batch,
+            max_batch_size=SCORE_BATCH_MAX_SIZE,
+            max_latency_ms=SCORE_BATCH_MAX_LATENCY_MS,
+            runner=lambda batch_fn, key, updates: batch_fn(key, updates)
+        )
+        
+        # Stored scores, read from the event index plus our own recent writes
+        self.score_mirror = ScoreMirror(
+            _indexed_scores,
+            max_recent=int(os.getenv('SCORE_RECENT_WRITES_SIZE', '10000')),
+            recent_ttl=float(os.getenv('SCORE_RECENT_WRITES_TTL', '600'))
+        )
+
+    async def _connect(self):
+        if not self._session_attached:
+            await self.w3.provider.cache_async_session(http_pool.session)
+            self._session_attached = True
+
+    async def chain_id(self) -> int:
+        if self._chain_id is None:
+            await self._connect()
+            self._chain_id = await self.w3.eth.chain_id
+        return self._chain_id
+
+    async def _send_transaction(self, contract_function) -> bool:
+        receipt = await self._submit(contract_function)
+        return (await receipt).status == 1
+
+    async def _submit(self, contract_function, tx_params: Optional[Dict] = None) -> asyncio.Future:
+        await self._connect()
+        if self.tx_queue.chain_id is None:
+            self.tx_queue.chain_id = await self.chain_id()
+        return await self.tx_queue.submit_call(contract_function, tx_params)
 
     async def update_scores(
         self,
@@ -50,54 +146,204 @@ class BlockchainService:
                 int(social_score)
             ]
             
-            # Build transaction
-            nonce = self.w3.eth.get_transaction_count(self.w3.eth.account.from_key(self.private_key).address)
-            
-            tx = self.contract.functions.updateScores(
-                user_address,
-                *scores
-            ).build_transaction({
-                'chainId': 1001,  # Units Network chain ID
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': nonce,
-            })
-            
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            
-            # Wait for transaction receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            return receipt.status == 1
+            return await self._send_transaction(
+                self.contract.functions.updateScores(user_address, *scores)
+            )
         except Exception as e:
             print(f"Error updating scores on blockchain: {e}")
             return False
             
-    async def verify_reference(self, user_address: str, reference_index: int) -> bool:
-        try:
-            nonce = self.w3.eth.get_transaction_count(self.w3.eth.account.from_key(self.private_key).address)
-            
-            tx = self.contract.functions.verifyReference(
-                user_address,
-                reference_index
-            ).build_transaction({
-                'chainId': 1001,
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': nonce,
-            })
+    async def update_scores_many(self, updates: List[Dict]) -> List[bool]:
+        """
+        Send one updateScores transaction per entry ({'address', 'overall',
+        'financial', 'professional', 'social'}) without waiting for earlier
+        receipts, then wait for all of them.
+        """
+        receipts = []
+        for update in updates:
+            try:
+                receipts.append(await self._submit(self.contract.functions.updateScores(
+                    update['address'],
+                    *self._score_values(update)
+                )))
+            except Exception as e:
+                print(f"Error updating scores on blockchain: {e}")
+                receipts.append(None)
+        
+        results = []
+        for receipt in receipts:
+            try:
+                results.append(receipt is not None and (await receipt).status == 1)
+            except Exception as e:
+                print(f"Error updating scores on blockchain: {e}")
+                results.append(False)
+        return results
             
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+    async def submit_score_update(self, update: Dict) -> bool:
+        """
+        Queue a score update ({'address', 'overall', 'financial',
+        'professional', 'social'}) to be written together with other
+        pending updates; resolves once its batch is confirmed. Updates
+        that would not change the stored scores by more than
+        SCORE_WRITE_MIN_DELTA are skipped and reported as successful.
+        Stored scores come from the event index, so without EVENT_INDEXER
+        only repeats of this process's recent writes are skipped.
+        """
+        scores = self._score_values(update)
+        try:
+            # The stored scores may be read from SQLite, so not on the event loop
+            if await analysis_executor.run_blocking(
+                self.score_mirror.is_redundant, update['address'], scores, SCORE_WRITE_MIN_DELTA
+            ):
+                return True
+        except Exception as e:
+            # Without stored scores, fall back to writing
+            print(f"Score mirror lookup error: {e}")
+        
+        written = await self.score_batcher.submit(update)
+        if written:
+            self.score_mirror.record(update['address'], scores)
+        return written
+
+    async def batch_update_scores(self, updates: List[Dict]) -> List[bool]:
+        """
+        Write score updates with as few batchUpdateScores transactions as
+        the gas budget allows. Batches are sent back to back. Users without
+        an active profile are skipped by the contract (ScoreUpdateSkipped)
+        and reported as failed; a batch that cannot be estimated or reverts
+        (e.g. a deployed contract without batchUpdateScores) falls back to
+        one updateScores transaction per user.
+        """
+        if not self.supports_batch_updates:
+            return await self.update_scores_many(updates)
+        
+        receipts = []
+        start = 0
+        while start < len(updates):
+            batch, gas = await self._plan_score_batch(updates[start:start + SCORE_BATCH_MAX_SIZE])
+            if gas is None:
+                receipts.append((batch, None))
+            else:
+                try:
+                    receipts.append((batch, await self._submit(
+                        self._batch_update_call(batch), {'gas': gas}
+                    )))
+                except Exception as e:
+                    print(f"Error sending score batch: {e}")
+                    receipts.append((batch, None))
+            start += len(batch)
+        
+        results = []
+        for batch, receipt in receipts:
+            try:
+                if receipt is not None:
+                    confirmed = await receipt
+                    if confirmed.status == 1:
+                        skipped = self._skipped_users(confirmed)
+                        results.extend(update['address'].lower() not in skipped for update in batch)
+                        continue
+            except Exception as e:
+                print(f"Error confirming score batch: {e}")
+            results.extend(await self.update_scores_many(batch))
+        return results
+
+    def _skipped_users(self, receipt) -> set:
+        if not abi_has(self.contract_abi, 'event', 'ScoreUpdateSkipped'):
+            return set()
+        events = self.contract.events.ScoreUpdateSkipped().process_receipt(receipt, errors=DISCARD)
+        return {event['args']['user'].lower() for event in events}
+
+    async def _plan_score_batch(self, candidates: List[Dict]):
+        """
+        Shrink candidates until the batch's estimated gas fits the budget.
+        Returns (batch, gas limit), or (candidates, None) if the batch
+        cannot be estimated.
+        """
+        await self._connect()
+        batch = candidates
+        while True:
+            try:
+                estimate = await self._batch_update_call(batch).estimate_gas(
+                    {'from': self.account.address}
+                )
+            except Exception as e:
+                print(f"Score batch gas estimation failed: {e}")
+                return batch, None
+            if estimate <= SCORE_BATCH_GAS_LIMIT or len(batch) == 1:
+                # Headroom for state changes between estimation and mining
+                return batch, min(int(estimate * 1.2), max(SCORE_BATCH_GAS_LIMIT, estimate))
+            size = max(1, int(len(batch) * SCORE_BATCH_GAS_LIMIT / estimate * 0.9))
+            batch = batch[:min(size, len(batch) - 1)]
+
+    def _batch_update_call(self, updates: List[Dict]):
+        return self.contract.functions.batchUpdateScores(
+            [update['address'] for update in updates],
+            [self._score_values(update) for update in updates]
+        )
+
+    @staticmethod
+    def _score_values(update: Dict) -> List[int]:
+        return [
+            int(update['overall']),
+            int(update.get('financial', 0)),
+            int(update.get('professional', 0)),
+            int(update.get('social', 0))
+        ]
+
+    async def _write_score_batch(self, _, updates: List[Dict]) -> List[bool]:
+        return await self.batch_update_scores(updates)
             
-            return receipt.status == 1
+    async def verify_reference(self, user_address: str, reference_index: int) -> bool:
+        try:
+            return await self._send_transaction(
+                self.contract.functions.verifyReference(user_address, reference_index)
+            )
         except Exception as e:
             print(f"Error verifying reference on blockchain: {e}")
             return False
 
+_service: Optional[BlockchainService] = None
+
+
+def get_blockchain_service() -> BlockchainService:
+    """Tek, uzun ömürlü servis örneği; ilk kullanımda oluşturulur."""
+    global _service
+    if _service is None:
+        _service = BlockchainService()
+    return _service
+
+_indexer: Optional[EventIndexer] = None
+
+
+def get_event_indexer() -> EventIndexer:
+    """Kontrat olaylarının yerel SQLite indeksi; ilk kullanımda oluşturulur."""
+    global _indexer
+    if _indexer is None:
+        service = get_blockchain_service()
+        _indexer = EventIndexer.from_env(service.w3, service.contract)
+    return _indexer
+
+def _indexed_scores(address: str) -> Optional[Dict]:
+    # Only read the index while the background indexer keeps it current
+    return _indexer.get_scores(address) if _indexer is not None else None
+
+async def run_event_indexer():
+    """Keep the local event index in sync with the chain until cancelled."""
+    await get_blockchain_service()._connect()
+    await get_event_indexer().run(float(os.getenv('EVENT_INDEX_POLL_SECONDS', '5')))
+
+def blockchain_stats() -> Dict:
+    stats = {}
+    if _service is not None:
+        stats.update({
+            'transactions': _service.tx_queue.stats(),
+            'score_batches': _service.score_batcher.stats(),
+            'score_mirror': _service.score_mirror.stats()
+        })
+    if _indexer is not None:
+        stats['event_index'] = _indexer.stats()
+    return stats
+
 async def update_blockchain_scores(address: str, overall_score: float, details: Dict) -> bool:
     """
     Analiz sonuçlarını blockchain'e kaydeder.
@@ -111,39 +357,18 @@ async def update_blockchain_scores(address: str, overall_score: float, details:
         bool: İşlem başarılı ise True, değilse False
     """
     try:
-        service = BlockchainService()
-        
-        # Skorları normalize et (0-100 -> 0-1)
-        normalized_scores = {
-            'overall': overall_score / 100,
-            'financial': details.get('financial', 0) / 100,
-            'professional': details.get('professional', 0) / 100,
-            'social': details.get('social', 0) / 100
-        }
+        service = get_blockchain_service()
         
-        # Transaction'ı oluştur
-        tx = service.contract.functions.updateScores(
-            address,
-            int(normalized_scores['overall'] * 100),
-            int(normalized_scores['financial'] * 100),
-            int(normalized_scores['professional'] * 100),
-            int(normalized_scores['social'] * 100)
-        ).build_transaction({
-            'from': service.account.address,
-            'nonce': service.w3.eth.get_transaction_count(service.account.address),
-            'gas': 2000000,
-            'gasPrice': service.w3.eth.gas_price
+        # Skorları 0-100 aralığında tam sayı olarak, diğer bekleyen
+        # güncellemelerle aynı toplu işlemde gönder
+        return await service.submit_score_update({
+            'address': address,
+            'overall': overall_score,
+            'financial': details.get('financial', 0),
+            'professional': details.get('professional', 0),
+            'social': details.get('social', 0)
         })
         
-        # Transaction'ı imzala ve gönder
-        signed_tx = service.w3.eth.account.sign_transaction(tx, service.private_key)
-        tx_hash = service.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
-        # Transaction'ın onaylanmasını bekle
-        receipt = service.w3.eth.wait_for_transaction_receipt(tx_hash)
-        
-        return receipt.status == 1
-        
     except Exception as e:
         print(f"Blockchain güncelleme hatası: {e}")
-        return False
\ No newline at end of file
+        return False
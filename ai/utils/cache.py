@@ -0,0 +1,316 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.executors import analysis_executor
+
+
+class MemoryCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry TTL. Expired entries are
+    kept for stale_ttl more seconds and returned by get(allow_stale=True).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None, stale_ttl: float = 0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            now = time.time()
+            if expires_at is not None and expires_at <= now:
+                if expires_at + self.stale_ttl <= now:
+                    del self._entries[key]
+                    return None
+                if not allow_stale:
+                    return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk cache of JSON-serialisable values shared by every worker process
+    on the host. Entries expire by TTL (and are kept stale_ttl more seconds
+    for get(allow_stale=True)) and the least recently used ones are evicted
+    once the table grows beyond max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl: Optional[float] = None,
+                 table: str = 'cache', stale_ttl: float = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.table = table
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_at "
+                f"ON {self.table} (accessed_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        with conn:
+            if expires_at is not None and expires_at <= now:
+                if expires_at + self.stale_ttl <= now:
+                    conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    return None
+                if not allow_stale:
+                    return None
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now - self.stale_ttl,)
+        )
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def delete(self, key: str):
+        conn = self._connection()
+        with conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """
+    In-memory LRU tier in front of an optional SQLite tier, with hit and
+    miss counters for both. Async callers use aget()/aset()/aget_stale(),
+    which keep SQLite off the event loop, and get_or_fetch() for
+    single-flight loading.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self._in_flight = {}
+        self._counters = {
+            'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'sets': 0, 'coalesced': 0, 'stale_hits': 0
+        }
+
+    @classmethod
+    def from_env(cls, prefix: str, max_entries: int = 256, ttl: Optional[float] = 86400,
+                 table: str = 'cache', stale_ttl: float = 0) -> 'TieredCache':
+        """
+        Build a cache configured by <PREFIX>_SIZE, <PREFIX>_TTL (seconds,
+        0 disables expiry), <PREFIX>_STALE_TTL, <PREFIX>_PATH (enables the
+        SQLite tier) and <PREFIX>_DISK_SIZE.
+        """
+        max_entries = int(os.getenv(f'{prefix}_SIZE', str(max_entries)))
+        ttl = float(os.getenv(f'{prefix}_TTL', str(ttl or 0))) or None
+        stale_ttl = float(os.getenv(f'{prefix}_STALE_TTL', str(stale_ttl)))
+        memory = MemoryCache(max_entries=max_entries, ttl=ttl, stale_ttl=stale_ttl)
+
+        disk = None
+        path = os.getenv(f'{prefix}_PATH')
+        if path:
+            disk_entries = int(os.getenv(f'{prefix}_DISK_SIZE', str(max_entries * 10)))
+            disk = SQLiteCache(path, max_entries=disk_entries, ttl=ttl, table=table, stale_ttl=stale_ttl)
+
+        return cls(memory, disk)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._counters['memory_hits'] += 1
+            return value
+        return self._disk_result(key, self._read_disk(key))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() for async callers; the SQLite tier is read in the IO pool."""
+        value = self.memory.get(key)
+        if value is not None:
+            self._counters['memory_hits'] += 1
+            return value
+        if self.disk is not None:
+            value = await analysis_executor.run_blocking(self._read_disk, key)
+        return self._disk_result(key, value)
+
+    def set(self, key: str, value: Any):
+        self._counters['sets'] += 1
+        self.memory.set(key, value)
+        self._write_disk(key, value)
+
+    async def aset(self, key: str, value: Any):
+        """set() for async callers; the SQLite write and eviction run in the IO pool."""
+        self._counters['sets'] += 1
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await analysis_executor.run_blocking(self._write_disk, key, value)
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Return the value for key even if it expired within stale_ttl."""
+        value = self.memory.get(key, allow_stale=True)
+        if value is None:
+            value = self._read_disk(key, allow_stale=True)
+        return self._stale_result(value)
+
+    async def aget_stale(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key, allow_stale=True)
+        if value is None and self.disk is not None:
+            value = await analysis_executor.run_blocking(self._read_disk, key, True)
+        return self._stale_result(value)
+
+    def _read_disk(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        if self.disk is None:
+            return None
+        try:
+            return self.disk.get(key, allow_stale=allow_stale)
+        except sqlite3.Error as e:
+            print(f"Disk cache read error: {e}")
+            return None
+
+    def _write_disk(self, key: str, value: Any):
+        if self.disk is None:
+            return
+        try:
+            self.disk.set(key, value)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Disk cache write error: {e}")
+
+    def _disk_result(self, key: str, value: Optional[Any]) -> Optional[Any]:
+        if value is not None:
+            self._counters['disk_hits'] += 1
+            self.memory.set(key, value)
+            return value
+        self._counters['misses'] += 1
+        return None
+
+    def _stale_result(self, value: Optional[Any]) -> Optional[Any]:
+        if value is not None:
+            self._counters['stale_hits'] += 1
+        return value
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """
+        Return the cached value for key, or await fetch() and cache what it
+        returns. Concurrent misses for the same key share one fetch. None
+        results are passed through but not cached, and a caller that is
+        cancelled (e.g. by a timeout) does not cancel the shared fetch.
+        """
+        value = await self.aget(key)
+        if value is not None:
+            return value
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._counters['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(self._fetch(key, fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        value = await fetch()
+        if value is not None:
+            await self.aset(key, value)
+        return value
+
+    def _fetch_done(self, key: str, task: asyncio.Future):
+        self._in_flight.pop(key, None)
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self) -> Dict:
+        hits = self._counters['memory_hits'] + self._counters['disk_hits']
+        lookups = hits + self._counters['misses']
+        return {
+            **self._counters,
+            'hits': hits,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'in_flight': len(self._in_flight),
+            'memory_entries': len(self.memory),
+            'disk_entries': len(self.disk) if self.disk is not None else None
+        }
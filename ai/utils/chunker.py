@@ -0,0 +1,141 @@
+import math
+import os
+import re
+from typing import Iterable, Iterator, List, Optional, Union
+
+# A sentence ends at terminal punctuation followed by whitespace, or at a
+# blank line (headings, list items and table rows rarely carry punctuation)
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+# Some tokenizers report a huge sentinel when no limit is configured
+_FALLBACK_MAX_LENGTH = 512
+
+
+def iter_batches(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TextChunker:
+    """
+    Packs whole sentences into chunks that fit a model's token budget.
+
+    Input can be a single string or an iterable of text pieces (e.g. pages);
+    chunks are produced lazily so long documents are never held in memory
+    as a full list of sections.
+    """
+
+    def __init__(self, tokenizer=None, max_tokens: int = 512, overlap_tokens: int = 0):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+
+    @classmethod
+    def for_pipelines(cls, *pipelines, reserved_tokens: int = 0, overlap_tokens: Optional[int] = None) -> 'TextChunker':
+        """Build a chunker whose budget fits every given pipeline's tokenizer."""
+        tokenizer = None
+        budgets = []
+        for pipe in pipelines:
+            pipe_tokenizer = getattr(pipe, 'tokenizer', None)
+            if pipe_tokenizer is None:
+                continue
+            tokenizer = tokenizer or pipe_tokenizer
+            max_length = pipe_tokenizer.model_max_length
+            if not max_length or max_length >= 100_000:
+                max_length = _FALLBACK_MAX_LENGTH
+            budgets.append(max_length - pipe_tokenizer.num_special_tokens_to_add(pair=False))
+
+        max_tokens = min(budgets) if budgets else _FALLBACK_MAX_LENGTH
+        max_tokens -= reserved_tokens
+        env_limit = os.getenv('CHUNK_MAX_TOKENS')
+        if env_limit:
+            max_tokens = min(max_tokens, int(env_limit))
+        if overlap_tokens is None:
+            overlap_tokens = int(os.getenv('CHUNK_OVERLAP_TOKENS', '0'))
+
+        return cls(tokenizer=tokenizer, max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+
+    def count_tokens(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False))
+        # Rough subword estimate when no tokenizer is available
+        return math.ceil(len(text.split()) * 4 / 3)
+
+    def iter_sentences(self, texts: Union[str, Iterable[str]]) -> Iterator[str]:
+        if isinstance(texts, str):
+            texts = (texts,)
+
+        buffer = ''
+        for piece in texts:
+            if not piece:
+                continue
+            buffer += piece
+            start = 0
+            for match in _SENTENCE_BOUNDARY.finditer(buffer):
+                sentence = buffer[start:match.start()].strip()
+                if sentence:
+                    yield sentence
+                start = match.end()
+            # Keep the unfinished tail; it may continue in the next piece
+            buffer = buffer[start:]
+
+        sentence = buffer.strip()
+        if sentence:
+            yield sentence
+
+    def iter_chunks(self, texts: Union[str, Iterable[str]]) -> Iterator[str]:
+        current = []
+        current_tokens = 0
+
+        for sentence in self.iter_sentences(texts):
+            for part, tokens in self._fit_sentence(sentence):
+                if current and current_tokens + tokens > self.max_tokens:
+                    yield ' '.join(part for part, _ in current)
+                    current = self._overlap_tail(current, self.max_tokens - tokens)
+                    current_tokens = sum(count for _, count in current)
+                current.append((part, tokens))
+                current_tokens += tokens
+
+        if current:
+            yield ' '.join(part for part, _ in current)
+
+    def _fit_sentence(self, sentence: str) -> Iterator[tuple]:
+        tokens = self.count_tokens(sentence)
+        if tokens <= self.max_tokens:
+            yield sentence, tokens
+            return
+
+        # Sentence longer than the whole budget: fall back to word windows
+        window = []
+        window_tokens = 0
+        for word in sentence.split():
+            word_tokens = self.count_tokens(' ' + word)
+            if window and window_tokens + word_tokens > self.max_tokens:
+                yield ' '.join(window), window_tokens
+                window = []
+                window_tokens = 0
+            window.append(word)
+            window_tokens += word_tokens
+        if window:
+            yield ' '.join(window), window_tokens
+
+    def _overlap_tail(self, sentences: List[tuple], room: int) -> List[tuple]:
+        limit = min(self.overlap_tokens, room)
+        if limit <= 0:
+            return []
+        tail = []
+        tail_tokens = 0
+        for sentence, tokens in reversed(sentences):
+            if tail_tokens + tokens > limit:
+                break
+            tail.insert(0, (sentence, tokens))
+            tail_tokens += tokens
+        return tail
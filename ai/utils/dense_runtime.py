@@ -0,0 +1,123 @@
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    'tanh': np.tanh
+}
+
+# 'numpy' serves exported weights (or an untrained network with the same
+# layers when none are exported) and never imports TensorFlow; 'keras'
+# always builds the Keras model
+MODEL_RUNTIME = os.getenv('MODEL_RUNTIME', 'numpy').lower()
+
+
+class DenseNetwork:
+    """
+    Pure-NumPy forward pass for small Sequential models made of Dense layers
+    (Dropout is skipped, as at inference time). Called like a Keras model,
+    model(x, training=False), and returns an array of shape (n, units).
+    """
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray, str]]):
+        for _, _, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+        self.layers = [
+            (np.asarray(kernel, dtype=np.float32), np.asarray(bias, dtype=np.float32), activation)
+            for kernel, bias, activation in layers
+        ]
+
+    def __call__(self, x, training: bool = False) -> np.ndarray:
+        output = np.asarray(x, dtype=np.float32)
+        for kernel, bias, activation in self.layers:
+            output = ACTIVATIONS[activation](output @ kernel + bias)
+        return output
+
+    @property
+    def input_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    @classmethod
+    def initialize(cls, input_dim: int, spec: Sequence[Tuple[int, str]], seed: Optional[int] = None) -> 'DenseNetwork':
+        """Untrained network with Keras' default initializers (Glorot uniform kernels, zero biases)."""
+        rng = np.random.default_rng(seed)
+        layers = []
+        fan_in = input_dim
+        for units, activation in spec:
+            limit = np.sqrt(6 / (fan_in + units))
+            layers.append((rng.uniform(-limit, limit, (fan_in, units)), np.zeros(units), activation))
+            fan_in = units
+        return cls(layers)
+
+    @classmethod
+    def from_keras(cls, model) -> 'DenseNetwork':
+        layers = []
+        for layer in model.layers:
+            if layer.__class__.__name__ == 'Dropout':
+                continue
+            if layer.__class__.__name__ != 'Dense':
+                raise ValueError(f"Cannot export layer type {layer.__class__.__name__}")
+            kernel, bias = layer.get_weights()
+            layers.append((kernel, bias, layer.get_config()['activation']))
+        return cls(layers)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {}
+        for index, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel_{index}'] = kernel
+            arrays[f'bias_{index}'] = bias
+        arrays['activations'] = np.array([activation for _, _, activation in self.layers])
+        # Writing through a handle keeps the path as given (np.savez would add .npz)
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'DenseNetwork':
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(activation) for activation in data['activations']]
+            return cls([
+                (data[f'kernel_{index}'], data[f'bias_{index}'], activation)
+                for index, activation in enumerate(activations)
+            ])
+
+
+def export_dense_model(model, path: str) -> DenseNetwork:
+    """Save a Keras (or already exported) Dense model's weights for the NumPy runtime."""
+    network = model if isinstance(model, DenseNetwork) else DenseNetwork.from_keras(model)
+    network.save(path)
+    return network
+
+
+def load_dense_model(
+    path: str,
+    input_dim: int,
+    spec: Sequence[Tuple[int, str]],
+    build_keras: Callable,
+    runtime: Optional[str] = None
+):
+    """
+    Model for serving: exported weights in the NumPy runtime when `path`
+    exists, otherwise an untrained NumPy network with the same layers (the
+    Keras model is untrained too until weights are exported). Only runtime
+    'keras' calls build_keras() and imports TensorFlow.
+    """
+    runtime = runtime or MODEL_RUNTIME
+    if runtime == 'keras':
+        return build_keras()
+
+    if os.path.exists(path):
+        try:
+            network = DenseNetwork.load(path)
+            if network.input_dim != input_dim:
+                raise ValueError(f"expected {input_dim} inputs, file has {network.input_dim}")
+            return network
+        except Exception as e:
+            print(f"Exported model could not be loaded ({path}): {e}")
+    return DenseNetwork.initialize(input_dim, spec)
+
@@ -0,0 +1,124 @@
+import codecs
+import functools
+import io
+from typing import BinaryIO, Dict, Iterator, Tuple, Union
+
+import docx
+import PyPDF2
+from nltk.corpus import stopwords
+
+from utils.text_stats import TextStatistics
+
+# A filesystem path, an in-memory buffer or a readable binary stream
+DocumentSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+SUPPORTED_FILE_TYPES = ('pdf', 'docx', 'txt')
+
+TEXT_READ_SIZE = 64 * 1024
+
+
+class DocumentReadError(Exception):
+    """The document could not be decoded (corrupt file or unsupported format)."""
+
+
+@functools.lru_cache(maxsize=1)
+def load_stop_words() -> frozenset:
+    return frozenset(stopwords.words('turkish') + stopwords.words('english'))
+
+
+def open_document_source(source: DocumentSource) -> BinaryIO:
+    if isinstance(source, str):
+        return open(source, 'rb')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def iter_document_text(
+    source: DocumentSource,
+    file_type: str,
+    max_pages: int = 0,
+    max_chars: int = 0
+) -> Iterator[str]:
+    """
+    Yield document text piece by piece (PDF pages, DOCX paragraphs, TXT
+    blocks), stopping once the page or character budget is used up
+    (0 means no limit). Extraction errors are raised as DocumentReadError,
+    so a document that fails part-way is reported as unreadable rather
+    than scored truncated.
+    """
+    try:
+        yield from _iter_text(source, file_type, max_pages, max_chars)
+    except DocumentReadError:
+        raise
+    except Exception as e:
+        raise DocumentReadError(f"Text extraction error: {e}") from e
+
+
+def _iter_text(source: DocumentSource, file_type: str, max_pages: int, max_chars: int) -> Iterator[str]:
+    if file_type == 'pdf':
+        pieces = _iter_pdf_pages
+    elif file_type == 'docx':
+        pieces = _iter_docx_paragraphs
+    elif file_type == 'txt':
+        pieces = _iter_txt_blocks
+    else:
+        raise DocumentReadError(f"Unsupported file type: {file_type}")
+
+    stream = open_document_source(source)
+    try:
+        remaining = max_chars or None
+        for piece in pieces(stream, max_pages):
+            if remaining is not None:
+                piece = piece[:remaining]
+                remaining -= len(piece)
+            if piece:
+                yield piece
+            if remaining == 0:
+                break
+    finally:
+        # Only close streams opened here; callers own their buffers
+        if isinstance(source, str):
+            stream.close()
+
+
+def _iter_pdf_pages(stream: BinaryIO, max_pages: int) -> Iterator[str]:
+    reader = PyPDF2.PdfReader(stream)
+    for page_number, page in enumerate(reader.pages):
+        if max_pages and page_number >= max_pages:
+            break
+        text = page.extract_text()
+        if text:
+            yield text + "\n"
+
+
+def _iter_docx_paragraphs(stream: BinaryIO, max_pages: int) -> Iterator[str]:
+    doc = docx.Document(stream)
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+
+def _iter_txt_blocks(stream: BinaryIO, max_pages: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while block := stream.read(TEXT_READ_SIZE):
+        yield decoder.decode(block)
+    yield decoder.decode(b'', final=True)
+
+
+def extract_document(
+    source: DocumentSource,
+    file_type: str,
+    max_pages: int = 0,
+    max_chars: int = 0
+) -> Tuple[str, Dict, float]:
+    """
+    CPU-bound document stage: decode the document and gather statistics in
+    the same streaming pass. Returns (text, document statistics, content
+    quality score). Picklable end to end so it can run in a process pool.
+    """
+    text_stats = TextStatistics(load_stop_words())
+    pieces = list(text_stats.observe(iter_document_text(source, file_type, max_pages, max_chars)))
+    if not text_stats.word_count:
+        return "", {}, 0.0
+    return "".join(pieces), text_stats.as_dict(), text_stats.quality_score()
@@ -0,0 +1,279 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from utils.executors import analysis_executor
+
+INDEXED_EVENTS = ('ProfileUpdated', 'ScoreUpdated', 'ReferenceAdded', 'ReferenceVerified')
+
+# Successful eth_getLogs calls in a row before the block range grows again
+GROW_AFTER_SUCCESSES = 4
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoint (id INTEGER PRIMARY KEY CHECK (id = 1), last_block INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS profiles ("
+    "user TEXT PRIMARY KEY, name TEXT, ipfs_hash TEXT, "
+    "overall_score INTEGER, financial_score INTEGER, professional_score INTEGER, social_score INTEGER, "
+    "profile_updated_at INTEGER, scores_updated_at INTEGER, block_number INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS user_references ("
+    "user TEXT NOT NULL, reference_index INTEGER NOT NULL, name TEXT, relationship_type TEXT, "
+    "ipfs_hash TEXT, is_verified INTEGER NOT NULL DEFAULT 0, verifier TEXT, "
+    "added_at INTEGER, verified_at INTEGER, block_number INTEGER NOT NULL, "
+    "PRIMARY KEY (user, reference_index))",
+    "CREATE INDEX IF NOT EXISTS profiles_overall_score ON profiles (overall_score)",
+    "CREATE INDEX IF NOT EXISTS user_references_verifier ON user_references (verifier)"
+)
+
+
+class EventIndexer:
+    """
+    Indexes TrustNet's profile, score and reference events into SQLite so
+    lookups do not need one getProfile/getReferences RPC per user.
+
+    Logs for all indexed events are fetched with a single eth_getLogs per
+    block range. The range halves when the node rejects a query (too many
+    results, range too large) and doubles after a run of successful
+    queries, up to max_range. Each range is applied in one transaction together with
+    the checkpoint, so a restart resumes from the last fully indexed block.
+    Logs at or below the checkpoint are skipped inside that transaction, so
+    a range re-applied by a retry or by another worker is not indexed twice.
+    Only blocks at least `confirmations` deep are indexed. Decoding and
+    SQLite work run in the IO thread pool, never on the event loop.
+    """
+
+    def __init__(
+        self,
+        w3,
+        contract,
+        path: str,
+        start_block: int = 0,
+        confirmations: int = 2,
+        initial_range: int = 2000,
+        max_range: int = 10000
+    ):
+        self.w3 = w3
+        self.contract = contract
+        self.path = path
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.block_range = initial_range
+        self.max_range = max_range
+        self._local = threading.local()
+        self._sync_lock = asyncio.Lock()
+        self._successes = 0
+        self._counters = {'ranges': 0, 'logs': 0, 'range_errors': 0}
+
+        # topic0 -> event name, from the contract ABI
+        self._topics = {}
+        for entry in contract.abi:
+            if entry.get('type') == 'event' and entry['name'] in INDEXED_EVENTS:
+                signature = f"{entry['name']}({','.join(arg['type'] for arg in entry['inputs'])})"
+                self._topics[w3.keccak(text=signature)] = entry['name']
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @classmethod
+    def from_env(cls, w3, contract) -> 'EventIndexer':
+        return cls(
+            w3,
+            contract,
+            os.getenv('EVENT_INDEX_PATH', 'data/trustnet_events.db'),
+            start_block=int(os.getenv('EVENT_INDEX_START_BLOCK', '0')),
+            confirmations=int(os.getenv('EVENT_INDEX_CONFIRMATIONS', '2')),
+            initial_range=int(os.getenv('EVENT_INDEX_BLOCK_RANGE', '2000')),
+            max_range=int(os.getenv('EVENT_INDEX_MAX_BLOCK_RANGE', '10000'))
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def last_block(self) -> int:
+        return self._checkpoint(self._connection())
+
+    def _checkpoint(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT last_block FROM checkpoint WHERE id = 1").fetchone()
+        return row['last_block'] if row else self.start_block - 1
+
+    async def sync(self) -> int:
+        """Index every confirmed block not indexed yet; returns the new checkpoint."""
+        async with self._sync_lock:
+            head = await self.w3.eth.block_number - self.confirmations
+            last_block = await analysis_executor.run_blocking(lambda: self.last_block)
+            while last_block < head:
+                from_block = last_block + 1
+                to_block = min(from_block + self.block_range - 1, head)
+                try:
+                    logs = await self.w3.eth.get_logs({
+                        'address': self.contract.address,
+                        'fromBlock': from_block,
+                        'toBlock': to_block,
+                        'topics': [list(self._topics)]
+                    })
+                except Exception as e:
+                    self._counters['range_errors'] += 1
+                    self._successes = 0
+                    if self.block_range == 1:
+                        raise
+                    print(f"eth_getLogs failed for {self.block_range} blocks, shrinking range: {e}")
+                    self.block_range = max(1, self.block_range // 2)
+                    continue
+
+                stored, last_block = await analysis_executor.run_blocking(self._store, logs, to_block)
+                self._counters['ranges'] += 1
+                self._counters['logs'] += stored
+                self._successes += 1
+                if self._successes >= GROW_AFTER_SUCCESSES:
+                    self.block_range = min(self.block_range * 2, self.max_range)
+                    self._successes = 0
+            return last_block
+
+    async def run(self, poll_interval: float = 5):
+        """Keep the index up to date until cancelled."""
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"Event indexer error: {e}")
+            await asyncio.sleep(poll_interval)
+
+    def _store(self, logs: List, to_block: int):
+        """
+        Apply the logs of one block range and advance the checkpoint.
+        Returns (logs applied, checkpoint after the write).
+        """
+        conn = self._connection()
+        ordered = sorted(logs, key=lambda log: (log['blockNumber'], log['logIndex']))
+        stored = 0
+        with conn:
+            # Take the write lock before reading the checkpoint, so blocks
+            # another writer indexed meanwhile are seen and skipped
+            conn.execute("BEGIN IMMEDIATE")
+            last_block = self._checkpoint(conn)
+            if to_block <= last_block:
+                return 0, last_block
+            for log in ordered:
+                if log['blockNumber'] <= last_block:
+                    continue
+                name = self._topics.get(bytes(log['topics'][0]))
+                if name is None:
+                    continue
+                event = getattr(self.contract.events, name)().process_log(log)
+                getattr(self, f'_on_{name}')(conn, event['args'], log['blockNumber'])
+                stored += 1
+            conn.execute(
+                "INSERT INTO checkpoint (id, last_block) VALUES (1, ?) "
+                "ON CONFLICT(id) DO UPDATE SET last_block = excluded.last_block",
+                (to_block,)
+            )
+        return stored, to_block
+
+    def _on_ProfileUpdated(self, conn: sqlite3.Connection, args, block_number: int):
+        conn.execute(
+            "INSERT INTO profiles (user, name, ipfs_hash, profile_updated_at, block_number) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(user) DO UPDATE SET "
+            "name = excluded.name, ipfs_hash = excluded.ipfs_hash, "
+            "profile_updated_at = excluded.profile_updated_at, block_number = excluded.block_number",
+            (args['user'].lower(), args['name'], args['ipfsHash'], args['timestamp'], block_number)
+        )
+
+    def _on_ScoreUpdated(self, conn: sqlite3.Connection, args, block_number: int):
+        conn.execute(
+            "INSERT INTO profiles (user, overall_score, financial_score, professional_score, "
+            "social_score, scores_updated_at, block_number) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(user) DO UPDATE SET "
+            "overall_score = excluded.overall_score, financial_score = excluded.financial_score, "
+            "professional_score = excluded.professional_score, social_score = excluded.social_score, "
+            "scores_updated_at = excluded.scores_updated_at, block_number = excluded.block_number",
+            (
+                args['user'].lower(), args['overallScore'], args['financialScore'],
+                args['professionalScore'], args['socialScore'], args['timestamp'], block_number
+            )
+        )
+
+    def _on_ReferenceAdded(self, conn: sqlite3.Connection, args, block_number: int):
+        # References are appended per user, so the index is the current count
+        # (which requires indexing from the contract's deployment block). Each
+        # log is applied once, under the checkpoint check in _store.
+        user = args['user'].lower()
+        reference_index = conn.execute(
+            "SELECT COUNT(*) FROM user_references WHERE user = ?", (user,)
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT OR REPLACE INTO user_references (user, reference_index, name, relationship_type, "
+            "ipfs_hash, added_at, block_number) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                user, reference_index, args['name'], args['relationshipType'],
+                args['ipfsHash'], args['timestamp'], block_number
+            )
+        )
+
+    def _on_ReferenceVerified(self, conn: sqlite3.Connection, args, block_number: int):
+        conn.execute(
+            "UPDATE user_references SET is_verified = 1, verifier = ?, verified_at = ?, block_number = ? "
+            "WHERE user = ? AND reference_index = ?",
+            (
+                args['verifier'].lower(), args['timestamp'], block_number,
+                args['user'].lower(), args['referenceIndex']
+            )
+        )
+
+    def get_profile(self, address: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT * FROM profiles WHERE user = ?", (address.lower(),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_scores(self, address: str) -> Optional[Dict]:
+        profile = self.get_profile(address)
+        if profile is None or profile['overall_score'] is None:
+            return None
+        return {
+            'overall': profile['overall_score'],
+            'financial': profile['financial_score'],
+            'professional': profile['professional_score'],
+            'social': profile['social_score'],
+            'updated_at': profile['scores_updated_at']
+        }
+
+    def lookup(self, address: str) -> Optional[Dict]:
+        """Profile, scores and references of one user, or None if the profile is not indexed."""
+        profile = self.get_profile(address)
+        if profile is None:
+            return None
+        return {
+            'profile': profile,
+            'scores': self.get_scores(address),
+            'references': self.get_references(address)
+        }
+
+    def get_references(self, address: str) -> List[Dict]:
+        rows = self._connection().execute(
+            "SELECT * FROM user_references WHERE user = ? ORDER BY reference_index", (address.lower(),)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        conn = self._connection()
+        return {
+            **self._counters,
+            'last_block': self.last_block,
+            'block_range': self.block_range,
+            'profiles': conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0],
+            'references': conn.execute("SELECT COUNT(*) FROM user_references").fetchone()[0]
+        }
@@ -0,0 +1,186 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+CPU_MODES = ('process', 'thread', 'inline')
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    # Module-level so it can be pickled into process pool workers; wall
+    # clock timestamps are comparable across processes
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    return started_at, time.time(), result
+
+
+class PoolMetrics:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self._lock = threading.Lock()
+
+    def submitted(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, submitted_at: float, started_at: Optional[float], finished_at: Optional[float], ok: bool):
+        with self._lock:
+            self.in_flight -= 1
+            if not ok:
+                self.failed += 1
+                return
+            self.completed += 1
+            wait = max(started_at - submitted_at, 0.0)
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_run += max(finished_at - started_at, 0.0)
+
+    def stats(self) -> Dict:
+        completed = self.completed
+        return {
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'queue_depth': max(self.in_flight - self.workers, 0),
+            'completed': completed,
+            'failed': self.failed,
+            'avg_wait_ms': round(self.total_wait / completed * 1000, 2) if completed else 0.0,
+            'max_wait_ms': round(self.max_wait * 1000, 2),
+            'avg_run_ms': round(self.total_run / completed * 1000, 2) if completed else 0.0
+        }
+
+
+class AnalysisExecutor:
+    """
+    Keeps blocking analysis work off the asyncio event loop.
+
+    run_inference() uses a thread pool, which suits model calls that release
+    the GIL. run_cpu() uses a process pool for pure-Python work such as NLTK
+    tokenization and PDF parsing; functions and arguments passed to it must
+    be picklable. cpu_mode 'thread' or 'inline' replaces the process pool,
+    e.g. for debugging or single-core hosts. run_blocking() uses a separate
+    thread pool for blocking network clients so slow APIs cannot starve
+    inference.
+    """
+
+    def __init__(
+        self,
+        inference_workers: int = 2,
+        cpu_workers: int = 2,
+        cpu_mode: str = 'process',
+        io_workers: int = 8
+    ):
+        if cpu_mode not in CPU_MODES:
+            raise ValueError(f"cpu_mode must be one of {CPU_MODES}")
+        self.cpu_mode = cpu_mode
+        self.inference_workers = inference_workers
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+        self._inference_pool = None
+        self._cpu_pool = None
+        self._io_pool = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            'inference': PoolMetrics('inference', inference_workers),
+            'cpu': PoolMetrics('cpu', cpu_workers),
+            'io': PoolMetrics('io', io_workers)
+        }
+
+    @classmethod
+    def from_env(cls) -> 'AnalysisExecutor':
+        return cls(
+            inference_workers=int(os.getenv('INFERENCE_THREADS', '2')),
+            cpu_workers=int(os.getenv('CPU_WORKERS', str(max(1, (os.cpu_count() or 2) // 2)))),
+            cpu_mode=os.getenv('CPU_EXECUTOR', 'process'),
+            io_workers=int(os.getenv('IO_THREADS', '8'))
+        )
+
+    def _get_inference_pool(self) -> Executor:
+        with self._lock:
+            if self._inference_pool is None:
+                self._inference_pool = ThreadPoolExecutor(
+                    max_workers=self.inference_workers,
+                    thread_name_prefix='inference'
+                )
+            return self._inference_pool
+
+    def _get_cpu_pool(self) -> Optional[Executor]:
+        with self._lock:
+            if self._cpu_pool is None and self.cpu_mode != 'inline':
+                if self.cpu_mode == 'process':
+                    # spawn avoids forking a parent that holds model threads
+                    self._cpu_pool = ProcessPoolExecutor(
+                        max_workers=self.cpu_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                else:
+                    self._cpu_pool = ThreadPoolExecutor(
+                        max_workers=self.cpu_workers,
+                        thread_name_prefix='cpu'
+                    )
+            return self._cpu_pool
+
+    def _get_io_pool(self) -> Executor:
+        with self._lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=self.io_workers,
+                    thread_name_prefix='io'
+                )
+            return self._io_pool
+
+    async def run_inference(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run('inference', self._get_inference_pool(), fn, args, kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run('cpu', self._get_cpu_pool(), fn, args, kwargs)
+
+    async def run_blocking(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run('io', self._get_io_pool(), fn, args, kwargs)
+
+    async def _run(self, name: str, pool: Optional[Executor], fn: Callable, args: tuple, kwargs: dict) -> Any:
+        metrics = self._metrics[name]
+        submitted_at = time.time()
+        metrics.submitted()
+        try:
+            if pool is None:
+                started_at, finished_at, result = _timed_call(fn, args, kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                started_at, finished_at, result = await loop.run_in_executor(
+                    pool,
+                    functools.partial(_timed_call, fn, args, kwargs)
+                )
+        except BaseException:
+            metrics.finished(submitted_at, None, None, ok=False)
+            raise
+        metrics.finished(submitted_at, started_at, finished_at, ok=True)
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            'cpu_mode': self.cpu_mode,
+            **{name: metrics.stats() for name, metrics in self._metrics.items()}
+        }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for pool in (self._inference_pool, self._cpu_pool, self._io_pool):
+                if pool is not None:
+                    pool.shutdown(wait=wait, cancel_futures=True)
+            self._inference_pool = None
+            self._cpu_pool = None
+            self._io_pool = None
+
+
+analysis_executor = AnalysisExecutor.from_env()
@@ -0,0 +1,111 @@
+import os
+from typing import Dict
+
+import aiohttp
+
+
+class HTTPClientPool:
+    """
+    One aiohttp session shared by every outbound call in the service, so
+    connections are kept alive and reused across requests. The connector
+    bounds total and per-host connections and caches DNS lookups. Started
+    and closed by the app lifespan; request and connection counters come
+    from aiohttp trace hooks.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30,
+        total_timeout: float = 30,
+        connect_timeout: float = 10
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self._session = None
+        self._counters = {
+            'requests': 0,
+            'in_flight': 0,
+            'failed': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0
+        }
+
+    @classmethod
+    def from_env(cls) -> 'HTTPClientPool':
+        return cls(
+            limit=int(os.getenv('HTTP_POOL_SIZE', '100')),
+            limit_per_host=int(os.getenv('HTTP_POOL_PER_HOST', '20')),
+            dns_cache_ttl=int(os.getenv('HTTP_DNS_CACHE_TTL', '300')),
+            keepalive_timeout=float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30')),
+            total_timeout=float(os.getenv('HTTP_TIMEOUT', '30')),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', '10'))
+        )
+
+    async def start(self):
+        self._ensure_session()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Also created on first use, for code running outside the app lifespan
+        return self._ensure_session()
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[self._trace_config()]
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        def count(name: str, delta: int = 1):
+            async def handler(session, context, params):
+                self._counters[name] += delta
+            return handler
+
+        trace_config.on_request_start.append(count('requests'))
+        trace_config.on_request_start.append(count('in_flight'))
+        trace_config.on_request_end.append(count('in_flight', -1))
+        trace_config.on_request_exception.append(count('in_flight', -1))
+        trace_config.on_request_exception.append(count('failed'))
+        trace_config.on_connection_create_end.append(count('connections_created'))
+        trace_config.on_connection_reuseconn.append(count('connections_reused'))
+        trace_config.on_dns_cache_hit.append(count('dns_cache_hits'))
+        trace_config.on_dns_cache_miss.append(count('dns_cache_misses'))
+        return trace_config
+
+    def stats(self) -> Dict:
+        connections = self._counters['connections_created'] + self._counters['connections_reused']
+        connector = self._session.connector if self._session is not None else None
+        return {
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'open': connector is not None and not connector.closed,
+            **self._counters,
+            'reuse_rate': round(self._counters['connections_reused'] / connections, 4) if connections else 0.0
+        }
+
+
+http_pool = HTTPClientPool.from_env()
@@ -0,0 +1,134 @@
+import hashlib
+import os
+from typing import Awaitable, Callable, Dict, List, Sequence
+
+from utils.cache import MemoryCache
+from utils.executors import analysis_executor
+from utils.micro_batcher import MicroBatcher
+from utils.model_registry import get_pipeline
+
+MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', '32'))
+MICRO_BATCH_MAX_LATENCY_MS = float(os.getenv('MICRO_BATCH_MAX_LATENCY_MS', '5'))
+INFERENCE_CACHE_SIZE = int(os.getenv('INFERENCE_CACHE_SIZE', '10000'))
+
+
+def _sentiment_batch(_, texts: List[str]) -> List[Dict]:
+    return get_pipeline("sentiment-analysis")(texts, batch_size=len(texts), truncation=True)
+
+
+def _zero_shot_batch(labels: tuple, texts: List[str]) -> List[Dict]:
+    results = get_pipeline("zero-shot-classification")(
+        texts,
+        candidate_labels=list(labels),
+        batch_size=MICRO_BATCH_MAX_SIZE
+    )
+    return [results] if isinstance(results, dict) else results
+
+
+def _callable_batch(fn: Callable[[List], List], items: List) -> List:
+    return fn(items)
+
+
+def _batcher(batch_fn) -> MicroBatcher:
+    return MicroBatcher(
+        batch_fn,
+        max_batch_size=MICRO_BATCH_MAX_SIZE,
+        max_latency_ms=MICRO_BATCH_MAX_LATENCY_MS,
+        runner=analysis_executor.run_inference
+    )
+
+
+sentiment_batcher = _batcher(_sentiment_batch)
+zero_shot_batcher = _batcher(_zero_shot_batch)
+callable_batcher = _batcher(_callable_batch)
+
+# Per-text results keyed by a hash of model, labels and text, so rescanning
+# a profile only runs inference on texts it has not seen before
+inference_cache = MemoryCache(max_entries=INFERENCE_CACHE_SIZE)
+_memo_counters = {'hits': 0, 'misses': 0}
+_model_names = {}
+
+
+async def _model_name(task: str) -> str:
+    if task not in _model_names:
+        # Loading (if not warmed up yet) happens off the event loop
+        pipe = await analysis_executor.run_inference(get_pipeline, task)
+        _model_names[task] = getattr(pipe.model, 'name_or_path', task)
+    return _model_names[task]
+
+
+def _memo_key(model: str, labels: tuple, text: str) -> str:
+    payload = "\0".join((model, *labels, text)).encode('utf-8', 'surrogatepass')
+    return hashlib.sha256(payload).hexdigest()
+
+
+async def _memoized(
+    task: str,
+    labels: tuple,
+    texts: List[str],
+    infer: Callable[[List[str]], Awaitable[List[Dict]]]
+) -> List[Dict]:
+    if not INFERENCE_CACHE_SIZE or not texts:
+        return await infer(texts)
+
+    model = await _model_name(task)
+    keys = [_memo_key(model, labels, text) for text in texts]
+    results = [inference_cache.get(key) for key in keys]
+
+    # Repeated texts within the call are inferred once
+    missing = {}
+    for key, text, result in zip(keys, texts, results):
+        if result is None:
+            missing.setdefault(key, text)
+    _memo_counters['hits'] += len(texts) - sum(result is None for result in results)
+    _memo_counters['misses'] += len(missing)
+
+    if missing:
+        fresh = dict(zip(missing, await infer(list(missing.values()))))
+        for key, result in fresh.items():
+            inference_cache.set(key, result)
+        results = [fresh[key] if result is None else result for key, result in zip(keys, results)]
+    return results
+
+
+async def classify_sentiment(texts: Sequence[str]) -> List[Dict]:
+    """Sentiment for each text, memoized and batched with concurrent requests."""
+    return await _memoized(
+        "sentiment-analysis", (), list(texts),
+        sentiment_batcher.submit_many
+    )
+
+
+async def classify_zero_shot(texts: Sequence[str], labels: Sequence[str]) -> List[Dict]:
+    """Zero-shot results for each text, memoized and batched with requests using the same labels."""
+    labels = tuple(labels)
+    return await _memoized(
+        "zero-shot-classification", labels, list(texts),
+        lambda missing: zero_shot_batcher.submit_many(missing, key=labels)
+    )
+
+
+async def run_batched(fn: Callable[[List], List], items: Sequence) -> List:
+    """
+    Batch items across concurrent requests for a custom batch function.
+    fn must compare equal between calls (a module function or bound method).
+    """
+    return await callable_batcher.submit_many(list(items), key=fn)
+
+
+def inference_cache_stats() -> Dict:
+    lookups = _memo_counters['hits'] + _memo_counters['misses']
+    return {
+        **_memo_counters,
+        'hit_rate': round(_memo_counters['hits'] / lookups, 4) if lookups else 0.0,
+        'entries': len(inference_cache),
+        'max_entries': INFERENCE_CACHE_SIZE
+    }
+
+
+def batcher_stats() -> Dict:
+    return {
+        'sentiment': sentiment_batcher.stats(),
+        'zero_shot': zero_shot_batcher.stats(),
+        'custom': callable_batcher.stats()
+    }
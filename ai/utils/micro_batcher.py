@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class MicroBatcher:
+    """
+    Coalesces inference requests from concurrent coroutines into batched
+    calls.
+
+    Items submitted under the same key are collected for up to
+    max_latency_ms, or until max_batch_size items are waiting, and then
+    passed together to batch_fn(key, items), which must return one result
+    per item in order. Each caller gets back the results for its own items.
+    batch_fn is executed through runner (e.g. an executor's run_inference)
+    so the forward pass never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[Hashable, List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_latency_ms: float = 5.0,
+        runner: Optional[Callable[..., Awaitable[Any]]] = None
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max(0.0, max_latency_ms) / 1000
+        self.runner = runner
+        self._queues = {}
+        self._timers = {}
+        self._tasks = set()
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._total_queue_time = 0.0
+
+    async def submit(self, item: Any, key: Hashable = None) -> Any:
+        results = await self.submit_many([item], key)
+        return results[0]
+
+    async def submit_many(self, items: List[Any], key: Hashable = None) -> List[Any]:
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            queue = self._queues.setdefault(key, [])
+            queue.append((item, future, time.perf_counter()))
+            futures.append(future)
+            if len(queue) >= self.max_batch_size:
+                self._flush(key)
+
+        if self._queues.get(key) and key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_latency, self._flush, key)
+
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        queue = self._queues.pop(key, [])
+        for start in range(0, len(queue), self.max_batch_size):
+            batch = queue[start:start + self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._run_batch(key, batch))
+            # Keep a reference so the task is not garbage collected mid-run
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: Hashable, batch: List[tuple]):
+        items = [item for item, _, _ in batch]
+        flushed_at = time.perf_counter()
+
+        self._batches += 1
+        self._items += len(items)
+        self._max_batch = max(self._max_batch, len(items))
+        self._total_queue_time += sum(flushed_at - enqueued_at for _, _, enqueued_at in batch)
+
+        try:
+            if self.runner is not None:
+                results = await self.runner(self.batch_fn, key, items)
+            else:
+                results = self.batch_fn(key, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_latency_ms': self.max_latency * 1000,
+            'batches': self._batches,
+            'items': self._items,
+            'avg_batch_size': round(self._items / self._batches, 2) if self._batches else 0.0,
+            'largest_batch': self._max_batch,
+            'avg_queue_ms': round(self._total_queue_time / self._items * 1000, 2) if self._items else 0.0,
+            'pending': sum(len(queue) for queue in self._queues.values())
+        }
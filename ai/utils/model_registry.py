@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+DEFAULT_TASKS = ("sentiment-analysis", "zero-shot-classification")
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process in bytes (0 if it cannot be read)."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is a high-water mark in KiB on Linux, which is the best
+        # approximation available on platforms without /proc
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of transformers pipelines.
+
+    Every pipeline is loaded once per task (on first use or during warm-up)
+    and shared by all analyzers in the worker.
+    """
+
+    def __init__(self):
+        self._pipelines = {}
+        self._stats = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    def _lock_for(self, task: str) -> threading.Lock:
+        with self._registry_lock:
+            if task not in self._locks:
+                self._locks[task] = threading.Lock()
+            return self._locks[task]
+
+    def get(self, task: str):
+        model = self._pipelines.get(task)
+        if model is not None:
+            return model
+
+        # Only one thread loads a given task; the rest wait for it
+        with self._lock_for(task):
+            model = self._pipelines.get(task)
+            if model is None:
+                model = self._load(task)
+            return model
+
+    def _load(self, task: str):
+        from transformers import pipeline
+
+        print(f"Loading model pipeline: {task}")
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+
+        model = pipeline(task)
+
+        load_time = time.perf_counter() - started
+        rss_after = _current_rss_bytes()
+
+        self._stats[task] = {
+            'model': getattr(model.model, 'name_or_path', None),
+            'load_time_seconds': round(load_time, 3),
+            'rss_delta_mb': round(max(rss_after - rss_before, 0) / (1024 * 1024), 1),
+            'rss_after_mb': round(rss_after / (1024 * 1024), 1),
+            'loaded_at': time.time()
+        }
+        self._pipelines[task] = model
+        print(f"Model pipeline loaded: {task} ({load_time:.1f}s)")
+        return model
+
+    def is_loaded(self, task: str) -> bool:
+        return task in self._pipelines
+
+    def warm_up(self, tasks: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Load every task's pipeline. A failed load does not stop the others,
+        but is raised once all tasks were tried so callers (the readiness
+        check) see that warm-up failed.
+        """
+        failures = {}
+        for task in tasks or DEFAULT_TASKS:
+            try:
+                self.get(task)
+            except Exception as e:
+                print(f"Model warm-up error ({task}): {e}")
+                failures[task] = e
+        if failures:
+            raise RuntimeError("Model pipelines failed to load: " + "; ".join(
+                f"{task}: {error}" for task, error in failures.items()
+            ))
+        return self.stats()
+
+    def stats(self) -> Dict:
+        return {
+            'loaded': sorted(self._pipelines.keys()),
+            'models': {task: dict(info) for task, info in self._stats.items()},
+            'process_rss_mb': round(_current_rss_bytes() / (1024 * 1024), 1)
+        }
+
+
+model_registry = ModelRegistry()
+
+
+def get_pipeline(task: str):
+    return model_registry.get(task)
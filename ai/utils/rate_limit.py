@@ -0,0 +1,155 @@
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils.executors import analysis_executor
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, endpoint: str, retry_after: float):
+        self.endpoint = endpoint
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"Rate limit reached for {endpoint}, retry after {self.retry_after}s")
+
+
+class RateLimitBucket:
+    """
+    Token bucket for one API endpoint, refilled from the server's
+    x-rate-limit-* headers rather than a local guess. Until the first
+    response is seen the budget is unknown and calls go straight through.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._acquired = 0
+        self._shed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def update(self, limit: Optional[int], remaining: Optional[int], reset_at: Optional[float]):
+        # Called from the IO threads that see the HTTP responses
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                self.remaining = remaining
+            if reset_at is not None:
+                self.reset_at = reset_at
+
+    def exhaust(self, retry_after: float):
+        with self._lock:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at, time.time() + retry_after)
+
+    def retry_after(self) -> float:
+        return max(self.reset_at - time.time(), 0.0)
+
+    def _take(self) -> float:
+        """Take a token, or return the seconds until the window resets."""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None:
+                return 0.0
+            if self.remaining <= 0 and self.reset_at <= now:
+                # Window rolled over; the next response will correct this
+                self.remaining = self.limit or 1
+            if self.remaining > 0:
+                self.remaining -= 1
+                return 0.0
+            return self.reset_at - now
+
+    async def acquire(self, max_wait: float):
+        """
+        Wait for a token for at most max_wait seconds; if the window resets
+        later than that, shed the call with RateLimitExceeded instead.
+        """
+        started_at = time.monotonic()
+        while True:
+            wait = self._take()
+            waited = time.monotonic() - started_at
+            if wait <= 0:
+                self._acquired += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+                return
+            if waited + wait > max_wait:
+                self._shed += 1
+                raise RateLimitExceeded(self.name, wait)
+            self._queued += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._queued -= 1
+
+    def stats(self) -> Dict:
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset_in': round(self.retry_after(), 1),
+            'queued': self._queued,
+            'acquired': self._acquired,
+            'shed': self._shed,
+            'avg_wait_ms': round(self._total_wait / self._acquired * 1000, 2) if self._acquired else 0.0,
+            'max_wait_ms': round(self._max_wait * 1000, 2)
+        }
+
+
+class RateLimitScheduler:
+    """
+    Schedules blocking API client calls against per-endpoint rate limit
+    budgets. Calls queue while the current window has a short time left
+    (at most max_wait seconds) and fail fast otherwise. Register
+    observe_response as a requests session response hook so every call
+    made through call() updates its endpoint's bucket.
+    """
+
+    def __init__(self, max_wait: float = 5.0):
+        self.max_wait = max_wait
+        self._buckets = {}
+        self._local = threading.local()
+
+    def bucket(self, endpoint: str) -> RateLimitBucket:
+        if endpoint not in self._buckets:
+            self._buckets[endpoint] = RateLimitBucket(endpoint)
+        return self._buckets[endpoint]
+
+    def observe_response(self, response, *args, **kwargs):
+        endpoint = getattr(self._local, 'endpoint', None)
+        if endpoint is None:
+            return
+        headers = response.headers
+        self.bucket(endpoint).update(
+            _header_int(headers, 'x-rate-limit-limit'),
+            _header_int(headers, 'x-rate-limit-remaining'),
+            _header_int(headers, 'x-rate-limit-reset')
+        )
+
+    async def call(self, endpoint: str, fn: Callable, *args, **kwargs) -> Any:
+        await self.bucket(endpoint).acquire(self.max_wait)
+        return await analysis_executor.run_blocking(self._call_tagged, endpoint, fn, args, kwargs)
+
+    def _call_tagged(self, endpoint: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        # Tells the response hook, running on this thread, which bucket to update
+        self._local.endpoint = endpoint
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._local.endpoint = None
+
+    def stats(self) -> Dict:
+        return {name: bucket.stats() for name, bucket in self._buckets.items()}
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
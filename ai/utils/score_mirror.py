@@ -0,0 +1,62 @@
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from utils.cache import MemoryCache
+
+SCORE_FIELDS = ('overall', 'financial', 'professional', 'social')
+
+
+class ScoreMirror:
+    """
+    Stored scores for the score write path, as the 4-tuple (overall,
+    financial, professional, social) the contract keeps.
+
+    Scores come from the SQLite event index (index_lookup, which returns
+    EventIndexer.get_scores() or None while the indexer is not running),
+    so the mirror has no chain scanning of its own and resumes from the
+    index's persisted checkpoint after a restart. Scores written by this
+    process are overlaid for recent_ttl seconds in a bounded LRU, because
+    the index only sees them once their blocks are confirmed.
+    """
+
+    def __init__(
+        self,
+        index_lookup: Callable[[str], Optional[Dict]],
+        max_recent: int = 10000,
+        recent_ttl: float = 600
+    ):
+        self._index_lookup = index_lookup
+        self._recent = MemoryCache(max_entries=max_recent, ttl=recent_ttl)
+        self._counters = {'skipped_writes': 0, 'writes': 0, 'index_misses': 0}
+
+    def get(self, address: str) -> Optional[Tuple[int, int, int, int]]:
+        address = address.lower()
+        scores = self._recent.get(address)
+        if scores is not None:
+            return scores
+        indexed = self._index_lookup(address)
+        if indexed is None:
+            self._counters['index_misses'] += 1
+            return None
+        return tuple(indexed[field] for field in SCORE_FIELDS)
+
+    def record(self, address: str, scores: Sequence[int]):
+        """Remember scores we just wrote, ahead of indexing their event."""
+        self._recent.set(address.lower(), tuple(int(score) for score in scores))
+
+    def is_redundant(self, address: str, scores: Sequence[int], min_delta: int = 0) -> bool:
+        """
+        True if every score differs from the stored one by at most
+        min_delta, so writing it would not be worth the gas.
+        """
+        stored = self.get(address)
+        redundant = stored is not None and all(
+            abs(int(new) - old) <= min_delta for new, old in zip(scores, stored)
+        )
+        self._counters['skipped_writes' if redundant else 'writes'] += 1
+        return redundant
+
+    def stats(self) -> Dict:
+        return {
+            **self._counters,
+            'recent_writes': len(self._recent)
+        }
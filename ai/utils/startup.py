@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# NLTK packages the document pipeline needs, by their nltk.data path;
+# nltk 3.8.2+ loads sent_tokenize and pos_tag from the _tab/_eng packages
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'averaged_perceptron_tagger_eng': 'taggers/averaged_perceptron_tagger_eng'
+}
+
+
+def missing_nltk_data() -> List[str]:
+    """NLTK packages not found under nltk.data.path. Nothing is downloaded."""
+    import nltk
+
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def check_nltk_data():
+    missing = missing_nltk_data()
+    if missing:
+        raise LookupError(
+            f"NLTK data missing: {', '.join(missing)} "
+            f"(install with: python -m nltk.downloader {' '.join(missing)})"
+        )
+
+
+class LazyComponent:
+    """
+    Builds an object the first time it is needed, once, from whichever
+    thread (warm-up or request) asks first.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    async def aget(self) -> Any:
+        # Imports and model construction stay off the event loop
+        if self._instance is not None:
+            return self._instance
+        return await asyncio.to_thread(self.get)
+
+
+class WarmupTracker:
+    """
+    Runs named start-up steps in order and records the state of each one
+    (pending, running, done or failed) for the readiness endpoint. A failed
+    step does not stop the ones after it. The service is ready once every
+    required step is done; a failed required step keeps it unready.
+    """
+
+    def __init__(self):
+        self._steps = []
+        self._state = {}
+        self._required = set()
+        self.started_at = time.time()
+
+    def add(self, name: str, fn: Callable[[], Any], required: bool = True):
+        self._steps.append((name, fn))
+        self._state[name] = {'status': 'pending'}
+        if required:
+            self._required.add(name)
+
+    def run(self):
+        for name, fn in self._steps:
+            self._state[name] = {'status': 'running'}
+            started = time.perf_counter()
+            try:
+                fn()
+                self._state[name] = {'status': 'done'}
+            except Exception as e:
+                print(f"Warm-up step failed ({name}): {e}")
+                self._state[name] = {'status': 'failed', 'error': str(e)}
+            self._state[name]['seconds'] = round(time.perf_counter() - started, 3)
+
+    @property
+    def ready(self) -> bool:
+        return all(self._state[name]['status'] == 'done' for name in self._required)
+
+    def status(self) -> Dict:
+        finished = sum(1 for state in self._state.values() if state['status'] in ('done', 'failed'))
+        return {
+            'ready': self.ready,
+            'progress': f"{finished}/{len(self._state)}",
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'steps': {
+                name: {**state, 'required': name in self._required}
+                for name, state in self._state.items()
+            }
+        }
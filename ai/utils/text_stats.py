@@ -0,0 +1,187 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+import nltk
+from nltk.tokenize import sent_tokenize
+
+# Alphanumeric runs; equivalent to stripping punctuation, tokenizing and
+# keeping str.isalnum() tokens, without running a full tokenizer
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+CITATION_PATTERN = re.compile(
+    r'\(\d{4}\)'        # (2024)
+    r'|\[[\d,\s]+\]'    # [1] or [1,2]
+    r'|et al\.'
+    r'|see\.'
+    r'|cf\.'
+)
+
+TECHNICAL_TERMS = frozenset([
+    'analysis', 'research', 'methodology', 'data', 'results',
+    'findings', 'evidence', 'study', 'report', 'hypothesis',
+    'investigation', 'conclusion', 'method', 'process', 'evaluation',
+    'assessment', 'review', 'examination', 'observation', 'theory'
+])
+
+PARAGRAPH_SEPARATOR = '\n\n'
+
+# Flush the complete sentences of a paragraph that has not ended yet once
+# this much text is pending, so inputs without blank lines are still
+# processed incrementally
+_MAX_PENDING_CHARS = 64 * 1024
+
+
+class TextStatistics:
+    """
+    Single-pass text statistics accumulator.
+
+    Text is fed incrementally (whole documents or page by page); each
+    paragraph is tokenized once and every counter used by the document
+    statistics and the content quality score is updated from that pass.
+    """
+
+    def __init__(self, stop_words: Set[str]):
+        self.stop_words = stop_words
+        self.char_count = 0
+        self.word_count = 0
+        self.word_length_total = 0
+        self.meaningful_count = 0
+        self.sentence_count = 0
+        self.paragraph_count = 0
+        self.citation_count = 0
+        self.technical_term_count = 0
+        self.word_freq = Counter()
+        self.meaningful_freq = Counter()
+        self._pending = ''
+        self._in_paragraph = False
+        self._summary = None
+
+    @classmethod
+    def from_text(cls, text: str, stop_words: Set[str]) -> 'TextStatistics':
+        stats = cls(stop_words)
+        stats.update(text)
+        stats.close()
+        return stats
+
+    def observe(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Pass text pieces through unchanged while accumulating statistics."""
+        for piece in pieces:
+            self.update(piece)
+            yield piece
+        self.close()
+
+    def update(self, text: str):
+        if not text:
+            return
+        self.char_count += len(text)
+        self._summary = None
+
+        *paragraphs, self._pending = (self._pending + text).split(PARAGRAPH_SEPARATOR)
+        for paragraph in paragraphs:
+            self._process_segment(paragraph)
+            self._in_paragraph = False
+
+        if len(self._pending) > _MAX_PENDING_CHARS:
+            self._flush_complete_sentences()
+
+    def close(self):
+        if self._pending:
+            self._process_segment(self._pending)
+            self._pending = ''
+        self._in_paragraph = False
+
+    def _flush_complete_sentences(self):
+        # The last sentence may continue in the next piece, so it stays
+        # pending and no sentence is split at the flush point
+        sentences = sent_tokenize(self._pending)
+        cut = self._pending.rfind(sentences[-1]) if len(sentences) > 1 else -1
+        if cut > 0:
+            self._process_segment(self._pending[:cut], sentence_count=len(sentences) - 1)
+        else:
+            # A single sentence longer than the limit: flush its words at a
+            # whitespace boundary and count the sentence with its remainder
+            cut = max(self._pending.rfind('\n'), self._pending.rfind(' '))
+            if cut <= 0:
+                return
+            self._process_segment(self._pending[:cut], sentence_count=0)
+        self._pending = self._pending[cut:]
+
+    def _process_segment(self, segment: str, sentence_count: Optional[int] = None):
+        if not segment.strip():
+            return
+        if not self._in_paragraph:
+            self.paragraph_count += 1
+            self._in_paragraph = True
+
+        self.citation_count += len(CITATION_PATTERN.findall(segment))
+        if sentence_count is None:
+            sentence_count = len(sent_tokenize(segment))
+        self.sentence_count += sentence_count
+
+        for word in _WORD_PATTERN.findall(segment.lower()):
+            self.word_count += 1
+            self.word_length_total += len(word)
+            self.word_freq[word] += 1
+            if word not in self.stop_words:
+                self.meaningful_count += 1
+                self.meaningful_freq[word] += 1
+                if word in TECHNICAL_TERMS:
+                    self.technical_term_count += 1
+
+    def _pos_counts(self) -> Dict[str, int]:
+        # Tag each distinct word once and weight by frequency instead of
+        # tagging the full (stopword-stripped, context-free) word stream
+        noun_count = 0
+        verb_count = 0
+        if self.meaningful_freq:
+            for word, tag in nltk.pos_tag(list(self.meaningful_freq)):
+                if tag.startswith('N'):
+                    noun_count += self.meaningful_freq[word]
+                elif tag.startswith('V'):
+                    verb_count += self.meaningful_freq[word]
+        return {'noun': noun_count, 'verb': verb_count}
+
+    def as_dict(self) -> Dict:
+        if self._summary is not None:
+            return dict(self._summary)
+
+        meaningful = self.meaningful_count
+        pos_counts = self._pos_counts()
+        self._summary = {
+            'word_count': self.word_count,
+            'unique_words': len(self.word_freq),
+            'vocabulary_richness': len(self.meaningful_freq) / meaningful if meaningful else 0,
+            'avg_word_length': self.word_length_total / self.word_count if self.word_count else 0,
+            'sentence_count': self.sentence_count,
+            'avg_sentence_length': self.word_count / self.sentence_count if self.sentence_count else 0,
+            'paragraph_count': self.paragraph_count,
+            'noun_ratio': pos_counts['noun'] / meaningful if meaningful else 0,
+            'verb_ratio': pos_counts['verb'] / meaningful if meaningful else 0,
+            'most_common_words': [word for word, _ in self.meaningful_freq.most_common(10)]
+        }
+        return dict(self._summary)
+
+    def quality_score(self) -> float:
+        meaningful = self.meaningful_count
+
+        # Word diversity
+        word_diversity = len(self.meaningful_freq) / meaningful if meaningful else 0
+
+        # Sentence structure (20 words optimal)
+        avg_sentence_length = self.word_count / self.sentence_count if self.sentence_count else 0
+        sentence_complexity = min(avg_sentence_length / 20, 1.0)
+
+        # Technical term usage
+        technical_score = min(self.technical_term_count / (meaningful * 0.05), 1.0) if meaningful else 0
+
+        # Reference and citation usage
+        citation_score = min(self.citation_count / 5, 1.0)
+
+        quality_factors = [
+            (word_diversity, 0.3),
+            (sentence_complexity, 0.2),
+            (technical_score, 0.3),
+            (citation_score, 0.2)
+        ]
+        return sum(score * weight for score, weight in quality_factors)
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+
+class TransactionQueue:
+    """
+    Pipelines signed transactions from one account. Nonces are assigned
+    locally under a lock (synced from the node's pending count on first use
+    and after a failed send), so concurrent callers never race on the same
+    nonce and do not wait for each other's receipts. Receipts are awaited
+    in background tasks; submit() returns a future that resolves to the
+    receipt. At most max_pending transactions are unconfirmed at a time.
+    """
+
+    def __init__(
+        self,
+        w3,
+        account,
+        chain_id: Optional[int] = None,
+        gas_limit: int = 2000000,
+        max_pending: int = 64,
+        receipt_timeout: float = 120,
+        gas_price_ttl: float = 5
+    ):
+        self.w3 = w3
+        self.account = account
+        self.chain_id = chain_id
+        self.gas_limit = gas_limit
+        self.max_pending = max_pending
+        self.receipt_timeout = receipt_timeout
+        self.gas_price_ttl = gas_price_ttl
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_pending)
+        self._next_nonce = None
+        self._gas_price = None
+        self._gas_price_at = 0.0
+        self._confirmations = set()
+        self._counters = {'submitted': 0, 'confirmed': 0, 'reverted': 0, 'failed': 0, 'resyncs': 0}
+        self._total_confirm_time = 0.0
+
+    @classmethod
+    def from_env(cls, w3, account, chain_id: Optional[int] = None, gas_limit: int = 2000000) -> 'TransactionQueue':
+        return cls(
+            w3,
+            account,
+            chain_id=chain_id,
+            gas_limit=gas_limit,
+            max_pending=int(os.getenv('TX_MAX_PENDING', '64')),
+            receipt_timeout=float(os.getenv('TX_RECEIPT_TIMEOUT', '120'))
+        )
+
+    async def submit_call(self, contract_function, tx_params: Optional[Dict] = None) -> asyncio.Future:
+        """Build, sign and send a contract call; see submit()."""
+        return await self.submit(tx_params or {}, contract_function)
+
+    async def submit(self, tx_params: Dict, contract_function=None) -> asyncio.Future:
+        """
+        Sign and send a transaction, filling in from, chainId, gas, gasPrice
+        and nonce when missing. Returns once the node has accepted it, with
+        a future for the receipt.
+        """
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                tx = await self._prepare(tx_params, contract_function)
+                signed_tx = self.account.sign_transaction(tx)
+                try:
+                    tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+                except Exception:
+                    # The nonce may or may not have been consumed; ask the node again
+                    self._next_nonce = None
+                    self._counters['resyncs'] += 1
+                    raise
+                self._next_nonce = tx['nonce'] + 1
+        except Exception:
+            self._counters['failed'] += 1
+            self._slots.release()
+            raise
+
+        self._counters['submitted'] += 1
+        receipt = asyncio.get_running_loop().create_future()
+        task = asyncio.ensure_future(self._confirm(tx_hash, receipt, time.perf_counter()))
+        self._confirmations.add(task)
+        task.add_done_callback(self._confirmations.discard)
+        return receipt
+
+    async def _prepare(self, tx_params: Dict, contract_function) -> Dict:
+        if self._next_nonce is None:
+            self._next_nonce = await self.w3.eth.get_transaction_count(self.account.address, 'pending')
+        if self.chain_id is None:
+            self.chain_id = await self.w3.eth.chain_id
+        if self._gas_price is None or time.monotonic() - self._gas_price_at > self.gas_price_ttl:
+            self._gas_price = await self.w3.eth.gas_price
+            self._gas_price_at = time.monotonic()
+
+        tx = {
+            'from': self.account.address,
+            'chainId': self.chain_id,
+            'gas': self.gas_limit,
+            'gasPrice': self._gas_price,
+            **tx_params,
+            'nonce': self._next_nonce
+        }
+        if contract_function is not None:
+            tx = await contract_function.build_transaction(tx)
+        return tx
+
+    async def _confirm(self, tx_hash, receipt: asyncio.Future, sent_at: float):
+        try:
+            result = await self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=self.receipt_timeout, poll_latency=0.1
+            )
+        except Exception as e:
+            self._counters['failed'] += 1
+            if not receipt.done():
+                receipt.set_exception(e)
+        else:
+            self._counters['confirmed' if result.status == 1 else 'reverted'] += 1
+            self._total_confirm_time += time.perf_counter() - sent_at
+            if not receipt.done():
+                receipt.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def drain(self):
+        """Wait for every submitted transaction to be confirmed or to fail."""
+        if self._confirmations:
+            await asyncio.gather(*self._confirmations, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        settled = self._counters['confirmed'] + self._counters['reverted']
+        return {
+            **self._counters,
+            'pending': len(self._confirmations),
+            'max_pending': self.max_pending,
+            'next_nonce': self._next_nonce,
+            'avg_confirm_ms': round(self._total_confirm_time / settled * 1000, 2) if settled else 0.0
+        }
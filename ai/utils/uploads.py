@@ -0,0 +1,84 @@
+from typing import Iterable
+
+from starlette.formparsers import MultiPartParser
+from starlette.responses import JSONResponse
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+def configure_upload_spooling(spill_threshold: int):
+    """
+    Keep multipart uploads in memory up to spill_threshold bytes; larger
+    uploads roll over to an anonymous temporary file that is removed when
+    the upload is closed at the end of the request.
+
+    Starlette has no per-route setting for this, so it changes the
+    process-wide MultiPartParser.max_file_size (the SpooledTemporaryFile
+    rollover size, 1 MB by default) and applies to every form route. It
+    relies on that class attribute as it exists in Starlette 0.36 (pulled in
+    by fastapi==0.110.0); on versions without it the default is left alone.
+    """
+    if not hasattr(MultiPartParser, 'max_file_size'):
+        print("MultiPartParser.max_file_size not found; upload spooling keeps Starlette's default")
+        return
+    MultiPartParser.max_file_size = spill_threshold
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects request bodies larger than max_bytes on the given paths with a
+    413, checking Content-Length up front and counting bytes while the body
+    is streamed so chunked uploads are cut off as soon as they cross it.
+    """
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get('headers', []):
+            if name == b'content-length' and value.isdigit() and int(value) > self.max_bytes:
+                await self._reject(scope, receive, send)
+                return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLargeError(f"Upload exceeds {self.max_bytes} bytes")
+            return message
+
+        async def guarded_send(message):
+            # Whatever the app answers after the limit was hit (usually a
+            # body parsing error) is replaced by the 413 below
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+
+        if exceeded:
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            {'detail': f"File too large (maximum {self.max_bytes} bytes)"},
+            status_code=413
+        )
+        await response(scope, receive, send)
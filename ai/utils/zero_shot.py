@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+DEFAULT_HYPOTHESIS_TEMPLATE = "This example is {}."
+
+# Some tokenizers report a huge sentinel when no limit is configured
+_FALLBACK_MAX_LENGTH = 512
+
+
+class GroupedZeroShotClassifier:
+    """
+    Evaluates several candidate label sets against the same texts in one
+    batched pass over a zero-shot-classification pipeline.
+
+    Every text and every hypothesis is tokenized exactly once; the
+    premise/hypothesis pairs for all label sets are then run through the
+    NLI model together. Scores are normalised per label set the same way the
+    pipeline does for single-label classification, so results match calling
+    the pipeline once per label set.
+    """
+
+    def __init__(
+        self,
+        classifier,
+        label_groups: Dict[str, Sequence[str]],
+        batch_size: int = 16,
+        hypothesis_template: str = DEFAULT_HYPOTHESIS_TEMPLATE
+    ):
+        self.classifier = classifier
+        self.label_groups = {name: list(labels) for name, labels in label_groups.items()}
+        self.batch_size = max(1, batch_size)
+        self.hypothesis_template = hypothesis_template
+
+        self.labels = []
+        for labels in self.label_groups.values():
+            for label in labels:
+                if label not in self.labels:
+                    self.labels.append(label)
+        self._group_indices = {
+            name: [self.labels.index(label) for label in labels]
+            for name, labels in self.label_groups.items()
+        }
+
+        self._native = getattr(classifier, 'framework', None) == 'pt'
+        if self._native:
+            self.tokenizer = classifier.tokenizer
+            self.model = classifier.model
+            self.entailment_id = classifier.entailment_id
+
+            max_length = self.tokenizer.model_max_length
+            self.max_length = max_length if max_length and max_length < 100_000 else _FALLBACK_MAX_LENGTH
+            self._pair_special_tokens = self.tokenizer.num_special_tokens_to_add(pair=True)
+            self._uses_token_types = 'token_type_ids' in self.tokenizer.model_input_names
+
+            # Hypothesis encodings are shared by every section
+            self._hypothesis_ids = [
+                self.tokenizer.encode(hypothesis_template.format(label), add_special_tokens=False)
+                for label in self.labels
+            ]
+
+    @property
+    def hypothesis_tokens(self) -> int:
+        """Tokens a premise must leave free for the longest hypothesis."""
+        if not self._native:
+            return 0
+        return max(len(ids) for ids in self._hypothesis_ids) + self._pair_special_tokens
+
+    def classify(self, texts: Sequence[str]) -> List[Dict[str, Dict[str, float]]]:
+        return list(self.iter_classify(texts))
+
+    def iter_classify(self, texts: Iterable[str]) -> Iterator[Dict[str, Dict[str, float]]]:
+        """Yield {group: {label: score}} per text, batching as texts arrive."""
+        texts_per_batch = max(1, self.batch_size // len(self.labels))
+        pending = []
+        for text in texts:
+            pending.append(text)
+            if len(pending) >= texts_per_batch:
+                yield from self._classify_batch(pending)
+                pending = []
+        if pending:
+            yield from self._classify_batch(pending)
+
+    def _classify_batch(self, texts: List[str]) -> List[Dict[str, Dict[str, float]]]:
+        if not self._native:
+            return self._classify_with_pipeline(texts)
+
+        import torch
+
+        input_ids = []
+        token_type_ids = []
+        for text in texts:
+            premise_ids = self.tokenizer.encode(text, add_special_tokens=False)
+            for hypothesis_ids in self._hypothesis_ids:
+                # Truncate only the premise, as the pipeline does
+                budget = self.max_length - len(hypothesis_ids) - self._pair_special_tokens
+                premise = premise_ids[:max(budget, 0)]
+                input_ids.append(self.tokenizer.build_inputs_with_special_tokens(premise, hypothesis_ids))
+                if self._uses_token_types:
+                    token_type_ids.append(
+                        self.tokenizer.create_token_type_ids_from_sequences(premise, hypothesis_ids)
+                    )
+
+        entail_logits = []
+        for start in range(0, len(input_ids), self.batch_size):
+            features = {'input_ids': input_ids[start:start + self.batch_size]}
+            if self._uses_token_types:
+                features['token_type_ids'] = token_type_ids[start:start + self.batch_size]
+            inputs = self.tokenizer.pad(features, return_tensors='pt')
+            inputs = {key: value.to(self.model.device) for key, value in inputs.items()}
+            with torch.no_grad():
+                logits = self.model(**inputs).logits
+            entail_logits.append(logits[:, self.entailment_id].float().cpu().numpy())
+
+        entail_logits = np.concatenate(entail_logits).reshape(len(texts), len(self.labels))
+        return [self._normalise(row) for row in entail_logits]
+
+    def _normalise(self, entail_logits: np.ndarray) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name, indices in self._group_indices.items():
+            group_logits = entail_logits[indices]
+            exp_logits = np.exp(group_logits - group_logits.max())
+            scores = exp_logits / exp_logits.sum()
+            result[name] = {
+                self.labels[index]: float(score)
+                for index, score in zip(indices, scores)
+            }
+        return result
+
+    def _classify_with_pipeline(self, texts: List[str]) -> List[Dict[str, Dict[str, float]]]:
+        results = [{} for _ in texts]
+        for name, labels in self.label_groups.items():
+            outputs = self.classifier(
+                texts,
+                candidate_labels=labels,
+                hypothesis_template=self.hypothesis_template,
+                batch_size=self.batch_size
+            )
+            if isinstance(outputs, dict):
+                outputs = [outputs]
+            for result, output in zip(results, outputs):
+                result[name] = dict(zip(output['labels'], output['scores']))
+        return results
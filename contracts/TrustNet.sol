@@ -33,6 +33,7 @@ contract TrustNet is Ownable, ReentrancyGuard, Pausable {
     uint256 public constant MIN_SCORE = 0;
     uint256 public constant MAX_SCORE = 100;
     uint256 public constant MAX_REFERENCES = 10;
+    uint256 public constant MAX_BATCH_SIZE = 200;
 
     event ProfileUpdated(
         address indexed user,
@@ -50,6 +51,10 @@ contract TrustNet is Ownable, ReentrancyGuard, Pausable {
         uint256 timestamp
     );
 
+    // batchUpdateScores skips users without an active profile instead of
+    // reverting the whole batch
+    event ScoreUpdateSkipped(address indexed user, uint256 timestamp);
+
     event ReferenceAdded(
         address indexed user,
         string name,
@@ -88,10 +93,7 @@ contract TrustNet is Ownable, ReentrancyGuard, Pausable {
     }
 
     modifier validScore(uint256 score) {
-        require(
-            score >= MIN_SCORE && score <= MAX_SCORE,
-            "TrustNet: score out of range"
-        );
+        _checkScore(score);
         _;
     }
 
@@ -162,27 +164,36 @@ contract TrustNet is Ownable, ReentrancyGuard, Pausable {
         validScore(_professional)
         validScore(_social)
     {
-        require(_user != address(0), "TrustNet: invalid user address");
+        _setScores(_user, _overall, _financial, _professional, _social);
+    }
+
+    function batchUpdateScores(
+        address[] calldata _users,
+        uint256[4][] calldata _scores
+    ) external whenNotPaused nonReentrant onlyAuthorizedAI {
         require(
-            profiles[_user].isActive,
-            "TrustNet: profile does not exist or is inactive"
+            _users.length == _scores.length,
+            "TrustNet: users and scores length mismatch"
         );
-
-        UserProfile storage profile = profiles[_user];
-        profile.overallScore = _overall;
-        profile.financialScore = _financial;
-        profile.professionalScore = _professional;
-        profile.socialScore = _social;
-        profile.lastUpdated = block.timestamp;
-
-        emit ScoreUpdated(
-            _user,
-            _overall,
-            _financial,
-            _professional,
-            _social,
-            block.timestamp
+        require(
+            _users.length > 0 && _users.length <= MAX_BATCH_SIZE,
+            "TrustNet: invalid batch size"
         );
+
+        for (uint256 i = 0; i < _users.length; i++) {
+            uint256[4] calldata scores = _scores[i];
+            _checkScore(scores[0]);
+            _checkScore(scores[1]);
+            _checkScore(scores[2]);
+            _checkScore(scores[3]);
+
+            address user = _users[i];
+            if (user == address(0) || !profiles[user].isActive) {
+                emit ScoreUpdateSkipped(user, block.timestamp);
+                continue;
+            }
+            _setScores(user, scores[0], scores[1], scores[2], scores[3]);
+        }
     }
 
     function addReference(
@@ -246,6 +257,43 @@ contract TrustNet is Ownable, ReentrancyGuard, Pausable {
         );
     }
 
+    function _checkScore(uint256 score) private pure {
+        require(
+            score >= MIN_SCORE && score <= MAX_SCORE,
+            "TrustNet: score out of range"
+        );
+    }
+
+    function _setScores(
+        address _user,
+        uint256 _overall,
+        uint256 _financial,
+        uint256 _professional,
+        uint256 _social
+    ) private {
+        require(_user != address(0), "TrustNet: invalid user address");
+        require(
+            profiles[_user].isActive,
+            "TrustNet: profile does not exist or is inactive"
+        );
+
+        UserProfile storage profile = profiles[_user];
+        profile.overallScore = _overall;
+        profile.financialScore = _financial;
+        profile.professionalScore = _professional;
+        profile.socialScore = _social;
+        profile.lastUpdated = block.timestamp;
+
+        emit ScoreUpdated(
+            _user,
+            _overall,
+            _financial,
+            _professional,
+            _social,
+            block.timestamp
+        );
+    }
+
     function getProfile(
         address _user
     ) external view returns (UserProfile memory) {
@@ -0,0 +1,77 @@
+import pkg from 'hardhat';
+const { ethers } = pkg;
+
+// Compares gas for N single updateScores calls with one batchUpdateScores
+// call on the in-process Hardhat network:
+//   npx hardhat run scripts/benchmark-batch-gas.js
+// BATCH_SIZES=5,10,19 limits the batch sizes measured (at most the number
+// of signers minus one, since every user needs its own active profile).
+
+async function deployTrustNet(ai) {
+  const TrustNet = await ethers.getContractFactory("TrustNet");
+  const trustNet = await TrustNet.deploy();
+  await trustNet.waitForDeployment();
+
+  await (await trustNet.unpause()).wait();
+  await (await trustNet.authorizeAI(ai.address)).wait();
+  return trustNet;
+}
+
+async function createProfiles(trustNet, users) {
+  for (const [index, user] of users.entries()) {
+    const tx = await trustNet.connect(user).updateProfile(`User ${index}`, `ipfs-${index}`);
+    await tx.wait();
+  }
+}
+
+function scoresFor(index, round) {
+  return [50 + ((index + round) % 50), 40, 60, 70];
+}
+
+async function main() {
+  const [deployer, ...signers] = await ethers.getSigners();
+  const sizes = (process.env.BATCH_SIZES || `1,5,10,${signers.length}`)
+    .split(',')
+    .map(Number)
+    .filter((size) => size > 0 && size <= signers.length);
+
+  console.log("users | single txs (gas) | batch tx (gas) | saved");
+  for (const size of sizes) {
+    const users = signers.slice(0, size);
+    const trustNet = await deployTrustNet(deployer);
+    await createProfiles(trustNet, users);
+
+    // Round 0 writes the first scores so both rounds below update
+    // storage slots that are already set
+    const warmup = await trustNet.batchUpdateScores(
+      users.map((user) => user.address),
+      users.map((_, index) => scoresFor(index, 0))
+    );
+    await warmup.wait();
+
+    let singleGas = 0n;
+    for (const [index, user] of users.entries()) {
+      const tx = await trustNet.updateScores(user.address, ...scoresFor(index, 1));
+      singleGas += (await tx.wait()).gasUsed;
+    }
+
+    const batchTx = await trustNet.batchUpdateScores(
+      users.map((user) => user.address),
+      users.map((_, index) => scoresFor(index, 2))
+    );
+    const batchGas = (await batchTx.wait()).gasUsed;
+
+    const saved = Number(singleGas - batchGas) / Number(singleGas) * 100;
+    console.log(
+      `${String(size).padStart(5)} | ${String(singleGas).padStart(16)} | ` +
+      `${String(batchGas).padStart(14)} | ${saved.toFixed(1)}%`
+    );
+  }
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  });